@@ -21,7 +21,8 @@ config = context.config
 
 # interpret the config file for Python logging.
 # this line sets up loggers basically.
-if config.config_file_name is not None:
+# (skipped when a caller such as scripts/init_db.py runs alembic in-process)
+if config.config_file_name is not None and config.attributes.get("configure_logger", True):
     fileConfig(config.config_file_name)
 
 # add your model's MetaData object here
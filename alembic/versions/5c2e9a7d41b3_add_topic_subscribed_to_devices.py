@@ -0,0 +1,29 @@
+"""Add topic_subscribed to devices
+
+Revision ID: 5c2e9a7d41b3
+Revises: f917431b4a28
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c2e9a7d41b3'
+down_revision: Union[str, Sequence[str], None] = 'f917431b4a28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # existing devices start unsubscribed; scripts/subscribe_devices_to_topic.py backfills them
+    op.add_column('devices', sa.Column('topic_subscribed', sa.Boolean(), server_default=sa.false(), nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('devices', 'topic_subscribed')
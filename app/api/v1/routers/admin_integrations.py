@@ -18,6 +18,7 @@ def get_integrations_status(_: models.User = Depends(require_admin)):
     from app.services.analytics.ga4_data import health_check as ga4_data_health
     from app.services.pos.factory import get_pos_adapter
     from app.services.payments.mock import MockPayments
+    import ssl
     
     # get health status for each integration
     status = {
@@ -36,7 +37,9 @@ def get_integrations_status(_: models.User = Depends(require_admin)):
         "payments": {
             "status": "configured", 
             "provider": "mock",
-            "note": "Using mock payment provider"
+            "note": "Using mock payment provider",
+            # webhook HMACs go through OpenSSL; >= 1.1.1 uses SHA-NI where the CPU exposes it
+            "openssl": ssl.OPENSSL_VERSION
         }
     }
     
@@ -268,7 +268,7 @@ async def translate_text(
     
     # perform translation
     try:
-        translated_text = translation_service.translate_text(
+        translated_text = await translation_service.atranslate_text(
             text=payload.text,
             target_language=payload.target_language,
             source_language=payload.source_language
@@ -10,6 +10,7 @@ from app.db.session import get_db
 from app import models
 from app.schemas.admin import PromoGenerateRequest, PromoGenerateResponse, PromoOut, PromoUpdate
 from app.schemas.promo_cart import PromoCodeCreate, PromoCodeUpdate
+from app.services.promo.validator import invalidate_promo
 
 router = APIRouter(prefix="/admin/promo", tags=["admin"])
 
@@ -136,6 +137,7 @@ def update_promocode(
     db.add(promo)
     db.commit()
     db.refresh(promo)
+    invalidate_promo(db, code)
     return promo
 
 
@@ -156,6 +158,7 @@ def delete_promocode(
     
     db.delete(promo)
     db.commit()
+    invalidate_promo(db, code)
     return {"message": "Promocode deleted successfully"}
 
 
@@ -211,6 +214,7 @@ def update_promo(promo_id: int, payload: PromoCodeUpdate, db: Session = Depends(
     
     db.commit()
     db.refresh(promo)
+    invalidate_promo(db, promo.code)
     return promo
 
 
@@ -222,4 +226,5 @@ def delete_promo(promo_id: int, db: Session = Depends(get_db), _=Depends(require
     
     db.delete(promo)
     db.commit()
+    invalidate_promo(db, promo.code)
     return {"message": "Promo code deleted successfully"}
@@ -10,7 +10,16 @@ from app.core.security import require_admin
 from app.db.session import get_db
 from app import models
 from app.schemas.admin import AdminPushRequest, AdminPushResponse, AdminSmsRequest, AdminSmsResponse, PushResult
-from app.services.push.fcm_admin import send_to_token, send_batch, send_to_topic
+from app.services.push.fcm_admin import (
+    ALL_DEVICES_TOPIC,
+    SYNC_BATCH_LIMIT,
+    TOPIC_FANOUT_THRESHOLD,
+    get_batch_job,
+    send_batch,
+    send_batch_async,
+    send_to_token,
+    send_to_topic,
+)
 from app.services.sms.twilio_sender import send_sms
 
 logger = logging.getLogger(__name__)
@@ -83,6 +92,53 @@ def _get_targeted_tokens(db: Session, targeting) -> tuple[List[str], str]:
     return tokens, targeting_method
 
 
+def _addresses_all_devices(db: Session, targeting) -> bool:
+    """true when an unfiltered "all" push is large enough for ALL_DEVICES_TOPIC and every device is on it."""
+    if targeting.audience != "all" or targeting.verified_only or targeting.platform or targeting.max_devices:
+        return False
+    devices = db.query(models.Device).filter(models.Device.fcm_token.is_not(None))
+    if devices.count() <= TOPIC_FANOUT_THRESHOLD:
+        return False
+    # a device that never got subscribed would silently miss a topic send
+    return devices.filter(models.Device.topic_subscribed.is_(False)).first() is None
+
+
+def _send_topic_push(req: AdminPushRequest, topic: str, targeting_method: str, timestamp: str) -> AdminPushResponse:
+    """send one topic message; topic sends are counted as a single send, FCM fans out server-side."""
+    logger.info(f"Sending topic push notification to '{topic}'")
+    result = send_to_topic(
+        topic=topic,
+        title=req.title,
+        body=req.body,
+        data=req.data,
+        priority=req.priority,
+        ttl=req.ttl
+    )
+    
+    if result["status"] == "sent":
+        return AdminPushResponse(
+            status="completed",
+            sent=1,  # Topic messages are counted as 1 successful send
+            failed=0,
+            total=1,
+            targeting_method=targeting_method,
+            timestamp=timestamp,
+            message_id=result["id"],
+            topic=topic
+        )
+    return AdminPushResponse(
+        status="error",
+        sent=0,
+        failed=1,
+        total=1,
+        targeting_method=targeting_method,
+        timestamp=timestamp,
+        topic=topic,
+        reason=result.get("reason", "unknown_error"),
+        errors=[result.get("error", "Unknown error")]
+    )
+
+
 @router.post("/send", response_model=AdminPushResponse)
 def send_push(req: AdminPushRequest, db: Session = Depends(get_db), _: models.User = Depends(require_admin)):
     """
@@ -134,39 +190,11 @@ def send_push(req: AdminPushRequest, db: Session = Depends(get_db), _: models.Us
             if not req.targeting.topic:
                 raise HTTPException(status_code=400, detail="Topic required for topic messaging")
             
-            logger.info(f"Sending topic push notification to '{req.targeting.topic}'")
-            result = send_to_topic(
-                topic=req.targeting.topic,
-                title=req.title,
-                body=req.body,
-                data=req.data,
-                priority=req.priority,
-                ttl=req.ttl
-            )
-            
-            if result["status"] == "sent":
-                return AdminPushResponse(
-                    status="completed",
-                    sent=1,  # Topic messages are counted as 1 successful send
-                    failed=0,
-                    total=1,
-                    targeting_method=f"topic:{req.targeting.topic}",
-                    timestamp=timestamp,
-                    message_id=result["id"],
-                    topic=req.targeting.topic
-                )
-            else:
-                return AdminPushResponse(
-                    status="error",
-                    sent=0,
-                    failed=1,
-                    total=1,
-                    targeting_method=f"topic:{req.targeting.topic}",
-                    timestamp=timestamp,
-                    topic=req.targeting.topic,
-                    reason=result.get("reason", "unknown_error"),
-                    errors=[result.get("error", "Unknown error")]
-                )
+            return _send_topic_push(req, req.targeting.topic, f"topic:{req.targeting.topic}", timestamp)
+        
+        # a large unfiltered "all" push is addressed to every device, one topic send covers it
+        if _addresses_all_devices(db, req.targeting):
+            return _send_topic_push(req, ALL_DEVICES_TOPIC, f"audience:all,topic:{ALL_DEVICES_TOPIC}", timestamp)
         
         # handle token-based messaging
         tokens, targeting_method = _get_targeted_tokens(db, req.targeting)
@@ -203,6 +231,24 @@ def send_push(req: AdminPushRequest, db: Session = Depends(get_db), _: models.Us
                 sent, failed = 0, 1
                 results = [PushResult(token=tokens[0][:20] + "...", success=False, error=result.get("error", "Unknown error"))]
             
+        elif len(tokens) > SYNC_BATCH_LIMIT:
+            # large fanouts run in the background, poll /admin/push/jobs/{job_id}
+            job_id = send_batch_async(
+                tokens,
+                title=req.title,
+                body=req.body,
+                data=req.data,
+                priority=req.priority,
+                ttl=req.ttl
+            )
+            return AdminPushResponse(
+                status="queued",
+                total=len(tokens),
+                targeting_method=targeting_method,
+                timestamp=timestamp,
+                job_id=job_id
+            )
+        
         else:
             result = send_batch(
                 tokens=tokens,
@@ -255,6 +301,15 @@ def send_push(req: AdminPushRequest, db: Session = Depends(get_db), _: models.Us
         )
 
 
+@router.get("/jobs/{job_id}")
+def get_push_job(job_id: str, _: models.User = Depends(require_admin)):
+    """status of a queued push fanout; the send_batch result once finished."""
+    job = get_batch_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
 @router.post("/send-sms", response_model=AdminSmsResponse)
 def send_sms_broadcast(req: AdminSmsRequest, db: Session = Depends(get_db), _: models.User = Depends(require_admin)):
     """send SMS message to all users with verified phone numbers."""
@@ -1,17 +1,35 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import Optional, List
 
 from app.core.security import optional_oauth2_scheme, decode_token, require_admin
-from app.db.session import get_db
+from app.db.session import get_db, SessionLocal
 from app import models
 from app.schemas.devices import DeviceRegisterRequest, DeviceOut
+from app.services.push.fcm_admin import ALL_DEVICES_TOPIC, subscribe_to_topic, unsubscribe_from_topic
 
 router = APIRouter(prefix="/devices", tags=["devices"])
 
 
+def _subscribe_device(device_id: int, fcm_token: str) -> None:
+    """subscribe a device to the all-devices topic and record it (runs after the response)."""
+    result = subscribe_to_topic([fcm_token], ALL_DEVICES_TOPIC)
+    if result.get("status") != "success" or result.get("failed_tokens"):
+        # stays unsubscribed, so all-device pushes keep using tokens; retried on next register
+        return
+    db = SessionLocal()
+    try:
+        db.query(models.Device).filter(
+            models.Device.id == device_id,
+            models.Device.fcm_token == fcm_token
+        ).update({models.Device.topic_subscribed: True}, synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
 @router.post("/register", response_model=DeviceOut)
-def register_device(payload: DeviceRegisterRequest, db: Session = Depends(get_db), token: Optional[str] = Depends(optional_oauth2_scheme)):
+def register_device(payload: DeviceRegisterRequest, background_tasks: BackgroundTasks, db: Session = Depends(get_db), token: Optional[str] = Depends(optional_oauth2_scheme)):
     user_id: Optional[int] = None
     if token:
         try:
@@ -33,6 +51,9 @@ def register_device(payload: DeviceRegisterRequest, db: Session = Depends(get_db
         db.add(device)
     db.commit()
     db.refresh(device)
+    if not device.topic_subscribed:
+        # subscribe after the response so large fanouts can go through the topic
+        background_tasks.add_task(_subscribe_device, device.id, device.fcm_token)
     return device
 
 
@@ -51,6 +72,7 @@ def list_devices(
 @router.delete("/{device_id}")
 def delete_device(
     device_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     _: models.User = Depends(require_admin)
 ):
@@ -59,6 +81,9 @@ def delete_device(
     if not device:
         raise HTTPException(status_code=404, detail="Device not found")
     
+    fcm_token = device.fcm_token
     db.delete(device)
     db.commit()
+    # a deleted device must stop receiving all-device topic pushes
+    background_tasks.add_task(unsubscribe_from_topic, [fcm_token], ALL_DEVICES_TOPIC)
     return {"message": "Device deleted successfully"}
@@ -22,7 +22,7 @@ router = APIRouter(prefix="/maps", tags=["maps"])
 
 
 @router.post("/forward-geocode")
-def forward_geocode(req: ForwardGeocodeRequest) -> GeocodeResponse:
+async def forward_geocode(req: ForwardGeocodeRequest) -> GeocodeResponse:
     """
     Forward geocoding: convert address text to coordinates.
     Biased to Kazakhstan with proper language settings.
@@ -31,7 +31,7 @@ def forward_geocode(req: ForwardGeocodeRequest) -> GeocodeResponse:
     If results are empty, UI should switch to Manual mode.
     """
     try:
-        result = svc_forward_geocode(
+        result = await svc_forward_geocode(
             address=req.address,
             language=req.language,
             region=req.region,
@@ -49,7 +49,7 @@ def forward_geocode(req: ForwardGeocodeRequest) -> GeocodeResponse:
 
 
 @router.post("/reverse-geocode")
-def reverse_geocode(req: ReverseGeocodeRequest) -> GeocodeResponse:
+async def reverse_geocode(req: ReverseGeocodeRequest) -> GeocodeResponse:
     """
     Reverse geocoding: convert coordinates to address text.
     Filters results for precision and biases to Kazakhstan.
@@ -58,7 +58,7 @@ def reverse_geocode(req: ReverseGeocodeRequest) -> GeocodeResponse:
     If response is low quality or empty, keep user's typed address.
     """
     try:
-        result = svc_reverse_geocode(
+        result = await svc_reverse_geocode(
             lat=req.lat,
             lng=req.lng,
             language=req.language,
@@ -127,7 +127,7 @@ def validate_address(address_data: OrderAddressData) -> AddressValidationRespons
 
 
 @router.get("/quick-reverse")
-def quick_reverse_geocode(
+async def quick_reverse_geocode(
     lat: float = Query(..., description="Latitude"),
     lng: float = Query(..., description="Longitude"),
     language: str = Query(default="ru", description="Language (ru, kk, en)"),
@@ -140,7 +140,7 @@ def quick_reverse_geocode(
     try:
         result_type = "street_address|premise|subpremise" if precise else None
         
-        result = svc_reverse_geocode(
+        result = await svc_reverse_geocode(
             lat=lat,
             lng=lng,
             language=language,
@@ -172,12 +172,12 @@ def place_legacy(place_id: str = Query(...), fields: str | None = Query(None), l
 
 
 @router.get("/geocode")
-def geocode_legacy(address: str = Query(...), lang: str | None = Query(None)):
+async def geocode_legacy(address: str = Query(...), lang: str | None = Query(None)):
     """legacy geocode endpoint. Use /forward-geocode instead."""
-    return svc_geocode_legacy(address=address, lang=lang)
+    return await svc_geocode_legacy(address=address, lang=lang)
 
 
 @router.post("/geocode")
-def geocode_legacy_post(req: GeocodeRequest):
+async def geocode_legacy_post(req: GeocodeRequest):
     """legacy geocode endpoint supporting POST requests. Use /forward-geocode instead."""
-    return svc_geocode_legacy(address=req.address, lang=req.lang)
+    return await svc_geocode_legacy(address=req.address, lang=req.lang)
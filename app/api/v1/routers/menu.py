@@ -10,7 +10,7 @@ from app.core.security import require_manager
 from app.schemas.menu import CategoryOut, CategoryCreate, CategoryUpdate, MenuItemOut, MenuItemCreate, MenuItemUpdate
 from app.schemas.admin import ImageUploadResponse, MenuItemImageUpdate
 from app.services.images.processor import image_processor
-from app.services.locale.locale_helper import get_localized_category_name, get_localized_menu_item_name, get_localized_menu_item_description
+from app.services.locale.locale_helper import get_localized_menu_item_name, get_localized_menu_item_description, localize_batch
 from app.services.locale.translation_service import get_translation_service
 
 router = APIRouter(prefix="/menu", tags=["menu"])
@@ -24,8 +24,7 @@ def list_categories(
     categories = db.query(models.Category).order_by(models.Category.sort.asc(), models.Category.name.asc()).all()
     
     # apply localization
-    for category in categories:
-        category.name = get_localized_category_name(category, lc)
+    localize_batch(categories, lc, ("name",))
     
     return categories
 
@@ -53,9 +52,7 @@ def list_items(
     items = q.all()
     
     # apply localization
-    for item in items:
-        item.name = get_localized_menu_item_name(item, lc)
-        item.description = get_localized_menu_item_description(item, lc)
+    localize_batch(items, lc, ("name", "description"))
     
     return items
 
@@ -191,17 +188,16 @@ def create_menu_item(
     description_translations = payload.description_translations
     
     if translation_service.is_available():
-        # Auto-translate name
-        name_translations = translation_service.auto_populate_translations(
-            payload.name, 
-            existing_translations=payload.name_translations
-        )
-        
-        # Auto-translate description if provided
+        # Auto-translate name and description (if provided) in one request
         if payload.description:
-            description_translations = translation_service.auto_populate_translations(
-                payload.description, 
-                existing_translations=payload.description_translations
+            name_translations, description_translations = translation_service.batch_auto_populate(
+                [payload.name, payload.description],
+                existing_translations=[payload.name_translations, payload.description_translations]
+            )
+        else:
+            name_translations = translation_service.auto_populate_translations(
+                payload.name, 
+                existing_translations=payload.name_translations
             )
     
     menu_item = models.MenuItem(
@@ -300,6 +296,22 @@ def delete_menu_item(
 
 # image upload endpoints (Admin only)
 
+def _delete_unreferenced_image(db: Session, image_url: Optional[str]) -> None:
+    """delete a processed image file unless a menu item or banner still points at it.
+    
+    Every upload has its own file name, but admins can paste the same URL into
+    several menu items or banners.
+    """
+    if not image_url or not image_url.startswith("/static/images/"):
+        return
+    still_used = (
+        db.query(models.MenuItem.id).filter(models.MenuItem.image_url == image_url).first()
+        or db.query(models.Banner.id).filter(models.Banner.image_url == image_url).first()
+    )
+    if not still_used:
+        image_processor.delete_image(image_url.replace("/static/images/", ""))
+
+
 @router.post("/images/upload", response_model=ImageUploadResponse)
 async def upload_image(
     file: UploadFile = File(...),
@@ -368,9 +380,7 @@ async def update_menu_item_image(
         db.refresh(menu_item)
         
         # optionally delete old image file (if it exists and was generated by us)
-        if old_image_url and old_image_url.startswith("/static/images/"):
-            old_filename = old_image_url.replace("/static/images/", "")
-            image_processor.delete_image(old_filename)
+        _delete_unreferenced_image(db, old_image_url)
         
         return menu_item
         
@@ -400,9 +410,7 @@ def remove_menu_item_image(
     db.commit()
     
     # optionally delete the file (if it was generated by us)
-    if old_image_url and old_image_url.startswith("/static/images/"):
-        old_filename = old_image_url.replace("/static/images/", "")
-        image_processor.delete_image(old_filename)
+    _delete_unreferenced_image(db, old_image_url)
     
     return {"message": "Image removed from menu item successfully"}
 
@@ -417,8 +425,7 @@ def get_categories(lc: str = "en", db: Session = None):
     categories = query.order_by(models.Category.sort.asc(), models.Category.name.asc()).all()
     
     # apply localization
-    for category in categories:
-        category.name = get_localized_category_name(category, lc)
+    localize_batch(categories, lc, ("name",))
     
     return categories
 
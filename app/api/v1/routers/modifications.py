@@ -13,7 +13,7 @@ from app.schemas.modifications import (
     ModificationResponse,
     OrderItemModificationOut,
 )
-from app.services.locale.locale_helper import get_localized_modification_type_name
+from app.services.locale.locale_helper import get_localized_modification_type_name, localize_batch
 from app.services.locale.translation_service import get_translation_service
 
 router = APIRouter(prefix="/modifications", tags=["modifications"])
@@ -38,8 +38,7 @@ def get_modification_types(
     modification_types = query.order_by(models.ModificationType.name).all()
     
     # apply localization
-    for mod_type in modification_types:
-        mod_type.name = get_localized_modification_type_name(mod_type, lc)
+    localize_batch(modification_types, lc, ("name",))
     
     return modification_types
 
@@ -1,5 +1,4 @@
 import hmac
-import hashlib
 from fastapi import APIRouter, Request, Header, HTTPException
 
 from app.core.config import settings
@@ -8,6 +7,8 @@ from app.services.payments.mock import MockPayments
 
 router = APIRouter(prefix="/payments", tags=["payments"]) 
 
+_WEBHOOK_SECRET = (settings.WEBHOOK_SECRET or "").encode()
+
 
 @router.post("/init", response_model=PaymentInitResponse)
 def init_payment(payload: PaymentInitRequest):
@@ -21,8 +22,7 @@ def init_payment(payload: PaymentInitRequest):
 @router.post("/callback")
 async def callback(request: Request, x_signature: str | None = Header(None)):
     body = await request.body()
-    secret = (settings.WEBHOOK_SECRET or "").encode()
-    computed = hmac.new(secret, body, hashlib.sha256).hexdigest()
+    computed = hmac.digest(_WEBHOOK_SECRET, body, "sha256").hex()
     if not x_signature or not hmac.compare_digest(computed, x_signature):
         raise HTTPException(status_code=401, detail="Invalid signature")
     return {"status": "ok"}
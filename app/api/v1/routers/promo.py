@@ -5,7 +5,7 @@ from decimal import Decimal
 from app.db.session import get_db
 from app import models
 from app.schemas.promo_cart import PromoValidateRequest, PromoValidateResponse
-from app.services.promo.validator import calculate_discount
+from app.services.promo.validator import calculate_discount, load_promo
 
 router = APIRouter(prefix="/promo", tags=["promo"])
 
@@ -19,7 +19,7 @@ def validate_promo(payload: PromoValidateRequest, db: Session = Depends(get_db))
         
         # add promocode details if valid
         if res.valid and payload.code:
-            promo = db.query(models.Promocode).filter(models.Promocode.code == payload.code).first()
+            promo = load_promo(db, payload.code)
             if promo:
                 response.promocode = {
                     "code": promo.code,
@@ -62,7 +62,7 @@ def validate_promo_code(promo_code: str = "", order_total: float = 0.0, db: Sess
     if not promo_code:
         return {"valid": False, "discount": 0.0, "reason": "Code required"}
     
-    promo = db.query(models.Promocode).filter(models.Promocode.code == promo_code).first()
+    promo = load_promo(db, promo_code)
     if not promo:
         return {"valid": False, "discount": 0.0, "reason": "Code not found", "message": "Code not found"}
     
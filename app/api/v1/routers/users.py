@@ -1,11 +1,12 @@
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from app.core.security import get_current_user, require_admin
 from app.db.session import get_db
 from app import models
 from app.schemas.users import UserMeOut, UserUpdate, SavedAddressCreate, SavedAddressUpdate, SavedAddressOut
+from app.services.push.fcm_admin import ALL_DEVICES_TOPIC, unsubscribe_from_topic
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -168,6 +169,7 @@ def delete_address(
 @router.delete("/{user_id}")
 def delete_user(
     user_id: int,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     _: models.User = Depends(require_admin)
 ):
@@ -187,7 +189,8 @@ def delete_user(
     # delete saved addresses
     db.query(models.SavedAddress).filter(models.SavedAddress.user_id == user_id).delete()
     
-    # delete user devices
+    # delete user devices (and take them off the all-devices topic once committed)
+    device_tokens = [t for (t,) in db.query(models.Device.fcm_token).filter(models.Device.user_id == user_id).all()]
     db.query(models.Device).filter(models.Device.user_id == user_id).delete()
     
     # delete verification records
@@ -197,6 +200,8 @@ def delete_user(
     # delete the user
     db.delete(user)
     db.commit()
+    if device_tokens:
+        background_tasks.add_task(unsubscribe_from_topic, device_tokens, ALL_DEVICES_TOPIC)
     return {"message": "User deleted successfully"}
 
 
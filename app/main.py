@@ -1,3 +1,6 @@
+import logging
+import ssl
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordBearer
@@ -7,6 +10,11 @@ from app.core.config import settings
 from app.db.session import engine
 from app.db.base import Base
 from app.api.v1.api import router as api_v1_router
+from app.services.maps import google as google_maps
+from app.services.push import fcm_admin
+from app.services.sms import twilio_sender
+
+logger = logging.getLogger(__name__)
 
 app = FastAPI(title="APPETIT API", version="0.1.0")
 
@@ -30,7 +38,17 @@ def on_startup():
     # db's handled by alembic migrations
     # run 'alembic upgrade head' or scripts/init_db.py
     # startup hook for any app-level init stuff
-    pass
+    # OTP hashing relies on OpenSSL's sha256 (SHA-NI accelerated on OpenSSL >= 1.1.1)
+    logger.info(f"hashlib backed by {ssl.OPENSSL_VERSION}")
+    # create push/SMS clients once instead of guarding every send
+    fcm_admin._ensure_init(strict=True)
+    twilio_sender._ensure_init(strict=True)
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    # close pooled outbound HTTP clients
+    await google_maps.close_client()
 
 
 @app.get("/health")
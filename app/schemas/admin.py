@@ -86,7 +86,7 @@ class PushResult(BaseModel):
 
 
 class AdminPushResponse(BaseModel):
-    status: str = Field(..., description="Overall status: completed, error, skipped")
+    status: str = Field(..., description="Overall status: completed, queued, error, skipped")
     sent: int = Field(0, description="Number of successfully sent notifications")
     failed: int = Field(0, description="Number of failed notifications")
     total: int = Field(0, description="Total number of devices targeted")
@@ -97,6 +97,7 @@ class AdminPushResponse(BaseModel):
     errors: Optional[List[str]] = Field(None, description="List of error reasons")
     results: Optional[List[PushResult]] = Field(None, description="Detailed per-device results")
     reason: Optional[str] = Field(None, description="Reason for skipped or error status")
+    job_id: Optional[str] = Field(None, description="Background job ID for queued large fanouts")
 
 
 class AdminSmsRequest(BaseModel):
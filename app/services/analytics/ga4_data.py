@@ -6,8 +6,7 @@ It complements the existing GA4 Measurement Protocol services by providing data
 """
 
 import os
-from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any
 
 # Graceful handling of Google Analytics Data API imports
 try:
@@ -2,6 +2,7 @@
 Business hours validation service.
 Handles working hours logic and order rejection during non-working hours.
 """
+import time as _time
 from datetime import datetime, time, timezone, timedelta
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass
@@ -27,6 +28,9 @@ class BusinessHoursValidationResult:
 class BusinessHoursService:
     """service for managing business hours and validation."""
     
+    # how long an is_open_now() result is reused (seconds)
+    CACHE_TTL = 1.0
+    
     def __init__(self):
         # default business hours (can be configured from db later)
         self.default_hours = {
@@ -41,15 +45,24 @@ class BusinessHoursService:
         
         # timezone for business hours (Kazakhstan time UTC+5)
         self.timezone = timezone(timedelta(hours=5))
+        
+        # (monotonic timestamp, result) of the last is_open_now() call
+        self._cache: Optional[Tuple[float, BusinessHoursValidationResult]] = None
     
     def get_current_time(self) -> datetime:
         """get current time in business timezone."""
         return datetime.now(self.timezone)
     
     def is_open_now(self) -> BusinessHoursValidationResult:
-        """check if business is currently open."""
+        """check if business is currently open (reused for CACHE_TTL seconds)."""
+        now = _time.monotonic()
+        if self._cache is not None and now - self._cache[0] < self.CACHE_TTL:
+            return self._cache[1]
+        
         current_time = self.get_current_time()
-        return self.is_open_at_time(current_time)
+        result = self.is_open_at_time(current_time)
+        self._cache = (now, result)
+        return result
     
     def is_open_at_time(self, check_time: datetime) -> BusinessHoursValidationResult:
         """check if business is open at specific time."""
@@ -142,6 +155,8 @@ class BusinessHoursService:
             close_time=close_time,
             is_closed=is_closed
         )
+        # after the assignment, so a concurrent is_open_now() can't re-cache the old hours
+        self._cache = None
     
     def get_weekly_hours(self) -> Dict[str, Dict]:
         """get formatted weekly hours for API response."""
@@ -1,7 +1,7 @@
 import os
-import hashlib
+from functools import lru_cache
 from typing import Dict, Optional, Any
-from urllib.parse import urlencode, urlparse, urlunparse, parse_qs
+from urllib.parse import urlencode, urlsplit, urlunsplit, parse_qsl
 
 try:
     import resend  # type: ignore
@@ -11,6 +11,7 @@ except Exception:  # pragma: no cover
 FROM_EMAIL = os.getenv("FROM_EMAIL", "notify@example.com")
 FROM_NAME = os.getenv("FROM_NAME", "MyApp")
 APP_URL = os.getenv("APP_URL", "https://ium.app")
+_FROM_HEADER = f"{FROM_NAME} <{FROM_EMAIL}>"
 
 # template configs
 TEMPLATES = {
@@ -47,17 +48,21 @@ def add_utm_parameters(url: str, template: str) -> str:
     if not url or not url.startswith(('http://', 'https://')):
         return url
     
-    parsed = urlparse(url)
-    query_params = parse_qs(parsed.query)
+    parts = urlsplit(url)
+    utm_params = [
+        ('utm_source', 'email'),
+        ('utm_medium', 'transactional'),
+        ('utm_campaign', template),
+    ]
+    utm_keys = {key for key, _ in utm_params}
+    # keep the pairs as a list, repeated keys (?b=1&b=2) must survive
+    query_params = [(key, value) for key, value in parse_qsl(parts.query) if key not in utm_keys]
     
     # add UTM params
-    query_params['utm_source'] = ['email']
-    query_params['utm_medium'] = ['transactional']
-    query_params['utm_campaign'] = [template]
+    query_params.extend(utm_params)
     
     # convert back to query string
-    new_query = urlencode(query_params, doseq=True)
-    return urlunparse(parsed._replace(query=new_query))
+    return urlunsplit(parts._replace(query=urlencode(query_params)))
 
 
 def select_subject(template: str, variables: Dict[str, Any], locale: str = "en") -> str:
@@ -107,6 +112,39 @@ def select_subject(template: str, variables: Dict[str, Any], locale: str = "en")
         return subject_template
 
 
+# localized strings used by render_template
+_TEXTS = {
+    "hello": {"en": "Hello", "ru": "Привет", "kk": "Сәлем"},
+    "verify_email_desc": {"en": "Please verify your email address to complete your account setup.", "ru": "Пожалуйста, подтвердите свой email для завершения настройки аккаунта.", "kk": "Тіркелгіні орнатуды аяқтау үшін электрондық поштаңызды растаңыз."},
+    "verification_code": {"en": "Your verification code", "ru": "Ваш код подтверждения", "kk": "Сіздің растау кодыңыз"},
+    "verify_email_btn": {"en": "Verify Email", "ru": "Подтвердить Email", "kk": "Email растау"},
+    "button_not_work": {"en": "If the button doesn't work, copy and paste this link", "ru": "Если кнопка не работает, скопируйте и вставьте эту ссылку", "kk": "Егер түйме жұмыс істемесе, осы сілтемені көшіріп жапсырыңыз"},
+    "order_confirmed": {"en": "Order #{order_id} Confirmed!", "ru": "Заказ №{order_id} подтвержден!", "kk": "Тапсырыс №{order_id} расталды!"},
+    "thank_you_order": {"en": "Thank you for your order. We're preparing it now.", "ru": "Спасибо за ваш заказ. Мы готовим его сейчас.", "kk": "Тапсырысыңыз үшін рахмет. Біз оны дайындап жатырмыз."},
+    "type": {"en": "Type", "ru": "Тип", "kk": "Түрі"},
+    "estimated_time": {"en": "Estimated time", "ru": "Предполагаемое время", "kk": "Болжалды уақыт"},
+    "view_order": {"en": "View Order", "ru": "Посмотреть заказ", "kk": "Тапсырысты көру"},
+    "pickup": {"en": "Pickup", "ru": "Самовывоз", "kk": "Өзіңіз алу"},
+    "delivery": {"en": "Delivery", "ru": "Доставка", "kk": "Жеткізу"},
+    "order_update": {"en": "Order #{order_id} Update", "ru": "Обновление заказа №{order_id}", "kk": "Тапсырыс №{order_id} жаңартылуы"},
+    "status_updated": {"en": "Your order status has been updated to", "ru": "Статус вашего заказа обновлен до", "kk": "Тапсырысыңыздың мәртебесі жаңартылды"},
+    "order_delivered_msg": {"en": "Order #{order_id} Delivered!", "ru": "Заказ №{order_id} доставлен!", "kk": "Тапсырыс №{order_id} жеткізілді!"},
+    "delivered_thanks": {"en": "Your order has been successfully delivered. Thank you for choosing us!", "ru": "Ваш заказ успешно доставлен. Спасибо, что выбрали нас!", "kk": "Тапсырысыңыз сәтті жеткізілді. Бізді таңдағаныңыз үшін рахмет!"},
+    "rate_experience": {"en": "How was your experience?", "ru": "Как вам понравился наш сервис?", "kk": "Біздің қызмет қалай ұнады?"},
+    "rate_order": {"en": "Rate Your Order", "ru": "Оценить заказ", "kk": "Тапсырысты бағалау"},
+    "password_reset_msg": {"en": "Password Reset Request", "ru": "Запрос на сброс пароля", "kk": "Құпия сөзді қалпына келтіру сұрауы"},
+    "reset_desc": {"en": "You requested to reset your password. Click the button below to create a new password:", "ru": "Вы запросили сброс пароля. Нажмите кнопку ниже, чтобы создать новый пароль:", "kk": "Сіз құпия сөзді қалпына келтіруді сұрадыңыз. Жаңа құпия сөз жасау үшін төмендегі түймені басыңыз:"},
+    "reset_password": {"en": "Reset Password", "ru": "Сбросить пароль", "kk": "Құпия сөзді қалпына келтіру"},
+    "ignore_if_not_requested": {"en": "If you didn't request this, please ignore this email.", "ru": "Если вы не запрашивали это, пожалуйста, проигнорируйте это письмо.", "kk": "Егер сіз мұны сұрамаған болсаңыз, бұл хатты елемеңіз."}
+}
+
+
+@lru_cache(maxsize=8)
+def _localized_texts(locale: str) -> Dict[str, str]:
+    """resolve the full string table for a locale once (falls back to English)."""
+    return {key: value.get(locale, value.get("en", "")) for key, value in _TEXTS.items()}
+
+
 def render_template(template: str, variables: Dict[str, Any], locale: str = "en") -> str:
     """render HTML template with variables, UTM parameters, and locale support."""
     # add UTM params to all URLs in variables
@@ -115,33 +153,7 @@ def render_template(template: str, variables: Dict[str, Any], locale: str = "en"
         if isinstance(value, str) and key.endswith('_url'):
             enhanced_vars[key] = add_utm_parameters(value, template)
     
-    # helper function to get localized text
-    def get_text(key: str) -> str:
-        texts = {
-            "hello": {"en": "Hello", "ru": "Привет", "kk": "Сәлем"},
-            "verify_email_desc": {"en": "Please verify your email address to complete your account setup.", "ru": "Пожалуйста, подтвердите свой email для завершения настройки аккаунта.", "kk": "Тіркелгіні орнатуды аяқтау үшін электрондық поштаңызды растаңыз."},
-            "verification_code": {"en": "Your verification code", "ru": "Ваш код подтверждения", "kk": "Сіздің растау кодыңыз"},
-            "verify_email_btn": {"en": "Verify Email", "ru": "Подтвердить Email", "kk": "Email растау"},
-            "button_not_work": {"en": "If the button doesn't work, copy and paste this link", "ru": "Если кнопка не работает, скопируйте и вставьте эту ссылку", "kk": "Егер түйме жұмыс істемесе, осы сілтемені көшіріп жапсырыңыз"},
-            "order_confirmed": {"en": "Order #{order_id} Confirmed!", "ru": "Заказ №{order_id} подтвержден!", "kk": "Тапсырыс №{order_id} расталды!"},
-            "thank_you_order": {"en": "Thank you for your order. We're preparing it now.", "ru": "Спасибо за ваш заказ. Мы готовим его сейчас.", "kk": "Тапсырысыңыз үшін рахмет. Біз оны дайындап жатырмыз."},
-            "type": {"en": "Type", "ru": "Тип", "kk": "Түрі"},
-            "estimated_time": {"en": "Estimated time", "ru": "Предполагаемое время", "kk": "Болжалды уақыт"},
-            "view_order": {"en": "View Order", "ru": "Посмотреть заказ", "kk": "Тапсырысты көру"},
-            "pickup": {"en": "Pickup", "ru": "Самовывоз", "kk": "Өзіңіз алу"},
-            "delivery": {"en": "Delivery", "ru": "Доставка", "kk": "Жеткізу"},
-            "order_update": {"en": "Order #{order_id} Update", "ru": "Обновление заказа №{order_id}", "kk": "Тапсырыс №{order_id} жаңартылуы"},
-            "status_updated": {"en": "Your order status has been updated to", "ru": "Статус вашего заказа обновлен до", "kk": "Тапсырысыңыздың мәртебесі жаңартылды"},
-            "order_delivered_msg": {"en": "Order #{order_id} Delivered!", "ru": "Заказ №{order_id} доставлен!", "kk": "Тапсырыс №{order_id} жеткізілді!"},
-            "delivered_thanks": {"en": "Your order has been successfully delivered. Thank you for choosing us!", "ru": "Ваш заказ успешно доставлен. Спасибо, что выбрали нас!", "kk": "Тапсырысыңыз сәтті жеткізілді. Бізді таңдағаныңыз үшін рахмет!"},
-            "rate_experience": {"en": "How was your experience?", "ru": "Как вам понравился наш сервис?", "kk": "Біздің қызмет қалай ұнады?"},
-            "rate_order": {"en": "Rate Your Order", "ru": "Оценить заказ", "kk": "Тапсырысты бағалау"},
-            "password_reset_msg": {"en": "Password Reset Request", "ru": "Запрос на сброс пароля", "kk": "Құпия сөзді қалпына келтіру сұрауы"},
-            "reset_desc": {"en": "You requested to reset your password. Click the button below to create a new password:", "ru": "Вы запросили сброс пароля. Нажмите кнопку ниже, чтобы создать новый пароль:", "kk": "Сіз құпия сөзді қалпына келтіруді сұрадыңыз. Жаңа құпия сөз жасау үшін төмендегі түймені басыңыз:"},
-            "reset_password": {"en": "Reset Password", "ru": "Сбросить пароль", "kk": "Құпия сөзді қалпына келтіру"},
-            "ignore_if_not_requested": {"en": "If you didn't request this, please ignore this email.", "ru": "Если вы не запрашивали это, пожалуйста, проигнорируйте это письмо.", "kk": "Егер сіз мұны сұрамаған болсаңыз, бұл хатты елемеңіз."}
-        }
-        return texts.get(key, {}).get(locale, texts.get(key, {}).get("en", ""))
+    L = _localized_texts(locale)
     
     if template == "verify_email":
         user_name = enhanced_vars.get("user_name", "User")
@@ -150,11 +162,11 @@ def render_template(template: str, variables: Dict[str, Any], locale: str = "en"
         
         html = f"""
         <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-            <h2>{get_text('hello')} {user_name}!</h2>
-            <p>{get_text('verify_email_desc')}</p>
-            {f'<p>{get_text("verification_code")}: <strong>{otp}</strong></p>' if otp else ''}
-            <p><a href="{verify_url}" style="background: #007cba; color: white; padding: 12px 24px; text-decoration: none; border-radius: 4px;">{get_text('verify_email_btn')}</a></p>
-            <p>{get_text('button_not_work')}: <a href="{verify_url}">{verify_url}</a></p>
+            <h2>{L['hello']} {user_name}!</h2>
+            <p>{L['verify_email_desc']}</p>
+            {f'<p>{L["verification_code"]}: <strong>{otp}</strong></p>' if otp else ''}
+            <p><a href="{verify_url}" style="background: #007cba; color: white; padding: 12px 24px; text-decoration: none; border-radius: 4px;">{L['verify_email_btn']}</a></p>
+            <p>{L['button_not_work']}: <a href="{verify_url}">{verify_url}</a></p>
         </div>
         """
         
@@ -165,15 +177,15 @@ def render_template(template: str, variables: Dict[str, Any], locale: str = "en"
         eta = enhanced_vars.get("eta", "")
         
         # localize pickup/delivery type
-        delivery_type_localized = get_text("pickup") if pickup_or_delivery.lower() == "pickup" else get_text("delivery")
+        delivery_type_localized = L["pickup"] if pickup_or_delivery.lower() == "pickup" else L["delivery"]
         
         html = f"""
         <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-            <h2>{get_text('order_confirmed').format(order_id=order_id)}</h2>
-            <p>{get_text('thank_you_order')}</p>
-            <p><strong>{get_text('type')}:</strong> {delivery_type_localized}</p>
-            <p><strong>{get_text('estimated_time')}:</strong> {eta}</p>
-            <p><a href="{order_url}" style="background: #007cba; color: white; padding: 12px 24px; text-decoration: none; border-radius: 4px;">{get_text('view_order')}</a></p>
+            <h2>{L['order_confirmed'].format(order_id=order_id)}</h2>
+            <p>{L['thank_you_order']}</p>
+            <p><strong>{L['type']}:</strong> {delivery_type_localized}</p>
+            <p><strong>{L['estimated_time']}:</strong> {eta}</p>
+            <p><a href="{order_url}" style="background: #007cba; color: white; padding: 12px 24px; text-decoration: none; border-radius: 4px;">{L['view_order']}</a></p>
         </div>
         """
         
@@ -184,9 +196,9 @@ def render_template(template: str, variables: Dict[str, Any], locale: str = "en"
         
         html = f"""
         <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-            <h2>{get_text('order_update').format(order_id=order_id)}</h2>
-            <p>{get_text('status_updated')}: <strong>{status.title()}</strong></p>
-            <p><strong>{get_text('estimated_time')}:</strong> {eta}</p>
+            <h2>{L['order_update'].format(order_id=order_id)}</h2>
+            <p>{L['status_updated']}: <strong>{status.title()}</strong></p>
+            <p><strong>{L['estimated_time']}:</strong> {eta}</p>
         </div>
         """
         
@@ -196,10 +208,10 @@ def render_template(template: str, variables: Dict[str, Any], locale: str = "en"
         
         html = f"""
         <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-            <h2>{get_text('order_delivered_msg').format(order_id=order_id)}</h2>
-            <p>{get_text('delivered_thanks')}</p>
-            <p>{get_text('rate_experience')}</p>
-            <p><a href="{rating_url}" style="background: #007cba; color: white; padding: 12px 24px; text-decoration: none; border-radius: 4px;">{get_text('rate_order')}</a></p>
+            <h2>{L['order_delivered_msg'].format(order_id=order_id)}</h2>
+            <p>{L['delivered_thanks']}</p>
+            <p>{L['rate_experience']}</p>
+            <p><a href="{rating_url}" style="background: #007cba; color: white; padding: 12px 24px; text-decoration: none; border-radius: 4px;">{L['rate_order']}</a></p>
         </div>
         """
         
@@ -208,11 +220,11 @@ def render_template(template: str, variables: Dict[str, Any], locale: str = "en"
         
         html = f"""
         <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
-            <h2>{get_text('password_reset_msg')}</h2>
-            <p>{get_text('reset_desc')}</p>
-            <p><a href="{reset_url}" style="background: #007cba; color: white; padding: 12px 24px; text-decoration: none; border-radius: 4px;">{get_text('reset_password')}</a></p>
-            <p>{get_text('ignore_if_not_requested')}</p>
-            <p>{get_text('button_not_work')}: <a href="{reset_url}">{reset_url}</a></p>
+            <h2>{L['password_reset_msg']}</h2>
+            <p>{L['reset_desc']}</p>
+            <p><a href="{reset_url}" style="background: #007cba; color: white; padding: 12px 24px; text-decoration: none; border-radius: 4px;">{L['reset_password']}</a></p>
+            <p>{L['ignore_if_not_requested']}</p>
+            <p>{L['button_not_work']}: <a href="{reset_url}">{reset_url}</a></p>
         </div>
         """
     else:
@@ -265,7 +277,7 @@ def send_email(
         html = render_template(template, variables, locale)
         
         params = {
-            "from": f"{FROM_NAME} <{FROM_EMAIL}>",
+            "from": _FROM_HEADER,
             "to": [to],
             "subject": subject,
             "html": html,
@@ -312,7 +324,7 @@ def send_html(to: str, subject: str, html: str, tags: Optional[Dict[str, str]] =
     try:
         resend.api_key = os.environ["RESEND_API_KEY"]
         params = {
-            "from": f"{FROM_NAME} <{FROM_EMAIL}>",
+            "from": _FROM_HEADER,
             "to": [to],
             "subject": subject,
             "html": html,
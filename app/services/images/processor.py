@@ -1,19 +1,31 @@
+import asyncio
+import hashlib
 import io
 import os
-import uuid
+import secrets
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Tuple
-from PIL import Image
+from typing import BinaryIO, Optional, Tuple
+import aiofiles
+import PIL
+from PIL import Image, features
 from fastapi import UploadFile, HTTPException
 import logging
 
 logger = logging.getLogger(__name__)
 
+# dedicated pool so image work doesn't compete with the default executor
+_IMAGE_EXECUTOR = ThreadPoolExecutor(max_workers=os.cpu_count(), thread_name_prefix="image")
+
 class ImageProcessor:
     """service for processing and converting images to webp format."""
     
-    # supported input formats
-    SUPPORTED_FORMATS = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp'}
+    # supported input formats (lowercase extensions, without the dot)
+    SUPPORTED_FORMATS = frozenset({'jpg', 'jpeg', 'png', 'gif', 'bmp', 'tiff', 'webp'})
+    UNSUPPORTED_FORMAT_DETAIL = (
+        f"Unsupported file format. Supported formats: {', '.join('.' + ext for ext in sorted(SUPPORTED_FORMATS))}"
+    )
     
     # maximum file size (10MB)
     MAX_FILE_SIZE = 10 * 1024 * 1024
@@ -21,10 +33,19 @@ class ImageProcessor:
     # image quality for webp conversion
     WEBP_QUALITY = 85
     
+    # libwebp effort level (0=fast .. 6=slow); 4 is libwebp's balanced default
+    WEBP_METHOD = 4
+    
     # maximum image dimensions
     MAX_WIDTH = 2048
     MAX_HEIGHT = 2048
     
+    # write buffer for saving processed images (64KB)
+    WRITE_BUFFER_SIZE = 64 * 1024
+    
+    # chunk size for hashing uploads (64KB)
+    READ_CHUNK_SIZE = 64 * 1024
+    
     def __init__(self, upload_dir: str = "static/images"):
         """Initialize the image processor.
         
@@ -33,6 +54,17 @@ class ImageProcessor:
         """
         self.upload_dir = Path(upload_dir)
         self.upload_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Pillow-SIMD (drop-in, vectorized resampling) tags its releases ".postN"
+        if ".post" not in PIL.__version__:
+            logger.info(
+                f"Running on stock Pillow {PIL.__version__}; install pillow-simd "
+                "for faster resize on x86"
+            )
+        
+        # plain libjpeg decodes 2-4x slower than libjpeg-turbo's SIMD IDCT
+        if not features.check_feature("libjpeg_turbo"):
+            logger.warning("Pillow is not linked against libjpeg-turbo; JPEG uploads will decode slowly")
     
     def validate_image_file(self, file: UploadFile) -> None:
         """Validate uploaded image file.
@@ -47,12 +79,9 @@ class ImageProcessor:
             raise HTTPException(status_code=400, detail="No filename provided")
         
         # check file extension
-        file_ext = Path(file.filename).suffix.lower()
-        if file_ext not in self.SUPPORTED_FORMATS:
-            raise HTTPException(
-                status_code=400, 
-                detail=f"Unsupported file format. Supported formats: {', '.join(self.SUPPORTED_FORMATS)}"
-            )
+        _, dot, file_ext = file.filename.rpartition('.')
+        if not dot or file_ext.lower() not in self.SUPPORTED_FORMATS:
+            raise HTTPException(status_code=400, detail=self.UNSUPPORTED_FORMAT_DETAIL)
         
         # check file size
         if hasattr(file, 'size') and file.size and file.size > self.MAX_FILE_SIZE:
@@ -81,7 +110,8 @@ class ImageProcessor:
         new_height = int(height * ratio)
         
         logger.info(f"Resizing image from {width}x{height} to {new_width}x{new_height}")
-        return image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        # reducing_gap lets Pillow box-reduce first on large downscales, then LANCZOS the rest
+        return image.resize((new_width, new_height), Image.Resampling.LANCZOS, reducing_gap=3.0)
     
     def convert_to_webp(self, image: Image.Image) -> Image.Image:
         """Convert image to webp format.
@@ -98,29 +128,132 @@ class ImageProcessor:
             background = Image.new('RGB', image.size, (255, 255, 255))
             if image.mode == 'P':
                 image = image.convert('RGBA')
-            background.paste(image, mask=image.split()[-1] if image.mode in ('RGBA', 'LA') else None)
+            # getchannel copies only the alpha band (split() would copy every band)
+            mask = image.getchannel('A') if image.mode in ('RGBA', 'LA') else None
+            background.paste(image, mask=mask)
             image = background
         elif image.mode not in ('RGB', 'L'):
             image = image.convert('RGB')
         
         return image
     
-    def generate_filename(self, original_filename: str) -> str:
+    def generate_filename(self, original_filename: str, content_hash: Optional[str] = None) -> str:
         """Generate unique filename for processed image.
         
         Args:
             original_filename: Original filename
+            content_hash: Digest of the upload, embedded so its shared blob can be found on delete
             
         Returns:
             New unique filename with .webp extension
         """
-        # generate UUID for uniqueness
-        unique_id = str(uuid.uuid4())
+        # every upload gets its own name (deleting one never affects another URL);
+        # the digest prefix lets identical uploads share the encoded bytes
+        unique_id = f"{content_hash}_{secrets.token_hex(8)}" if content_hash else secrets.token_hex(16)
         original_name = Path(original_filename).stem
         # clean the original name (keep only alphanumeric and common chars)
         clean_name = ''.join(c for c in original_name if c.isalnum() or c in '-_')[:50]
         return f"{clean_name}_{unique_id}.webp"
     
+    def _digest_sync(self, source: BinaryIO) -> str:
+        """Hash an upload with BLAKE2b and rewind it (runs in a worker thread).
+        
+        Args:
+            source: Readable binary file object positioned at the image start
+            
+        Returns:
+            Hex digest identifying the upload content
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for chunk in iter(lambda: source.read(self.READ_CHUNK_SIZE), b''):
+            digest.update(chunk)
+        source.seek(0)
+        return digest.hexdigest()
+    
+    def _blob_path(self, content_hash: str) -> Path:
+        """Canonical content-addressed copy of an encoded upload.
+        
+        Args:
+            content_hash: Digest of the upload
+            
+        Returns:
+            Path every upload with this digest is hard-linked to
+        """
+        return self.upload_dir / f"{content_hash}.webp"
+    
+    def _link_duplicate_sync(self, content_hash: str, file_path: Path) -> bool:
+        """Reuse an already encoded copy of the same upload (runs in a worker thread).
+        
+        Args:
+            content_hash: Digest of the upload
+            file_path: Destination path for this upload's own file
+            
+        Returns:
+            True if file_path now holds the encoded image, False if it must be encoded
+        """
+        blob_path = self._blob_path(content_hash)
+        try:
+            # hard link: separate name, shared bytes, each name can be deleted independently
+            os.link(blob_path, file_path)
+            return True
+        except FileNotFoundError:
+            # first upload of this content (or its blob was just removed)
+            return False
+        except OSError:
+            # no hard link support (e.g. some network/Windows mounts), fall back to a copy
+            try:
+                shutil.copyfile(blob_path, file_path)
+                return True
+            except FileNotFoundError:
+                return False
+    
+    def _register_blob_sync(self, content_hash: str, file_path: Path) -> None:
+        """Make a freshly encoded upload the canonical copy for its digest (runs in a worker thread).
+        
+        Args:
+            content_hash: Digest of the upload
+            file_path: The upload's own, fully written file
+        """
+        try:
+            os.link(file_path, self._blob_path(content_hash))
+        except OSError:
+            # already registered by a concurrent identical upload, or no hard links here;
+            # either way only deduplication of later uploads is affected
+            pass
+    
+    def _encode_sync(self, source: BinaryIO) -> io.BytesIO:
+        """Decode, resize and encode an image to webp (runs in a worker thread).
+        
+        Args:
+            source: Readable binary file object positioned at the image start
+            
+        Returns:
+            Buffer holding the encoded webp image
+        """
+        # open and process image
+        image = Image.open(source)
+        
+        # let libjpeg downscale by 1/2, 1/4 or 1/8 during decode;
+        # resize_image_if_needed finishes the remaining factor
+        if image.format in ('JPEG', 'MPO'):
+            image.draft('RGB', (self.MAX_WIDTH, self.MAX_HEIGHT))
+        
+        try:
+            # resize if needed
+            image = self.resize_image_if_needed(image)
+            
+            # convert to webp
+            image = self.convert_to_webp(image)
+            
+            # encode in memory, the coroutine writes it out asynchronously
+            buf = io.BytesIO()
+            image.save(buf, format='WEBP', quality=self.WEBP_QUALITY, method=self.WEBP_METHOD)
+            return buf
+        finally:
+            # Ensure image is closed to release file handles
+            if hasattr(image, 'close'):
+                image.close()
+    
     async def process_image(self, file: UploadFile) -> Tuple[str, str]:
         """Process uploaded image file.
         
@@ -137,39 +270,48 @@ class ImageProcessor:
             # check the file
             self.validate_image_file(file)
             
-            # read file content
-            content = await file.read()
+            # decode straight from the spooled upload instead of copying it into memory
+            await file.seek(0)
+            size = file.size
+            if size is None:
+                size = file.file.seek(0, os.SEEK_END)
+                file.file.seek(0)
             
-            # additional size check after reading
-            if len(content) > self.MAX_FILE_SIZE:
+            # additional size check for uploads without a declared size
+            if size > self.MAX_FILE_SIZE:
                 raise HTTPException(
                     status_code=400, 
                     detail=f"File too large. Maximum size: {self.MAX_FILE_SIZE // (1024*1024)}MB"
                 )
             
-            # open and process image
-            image = Image.open(io.BytesIO(content))
+            # hashing/decode/resize/encode are CPU-bound, keep them off the event loop
+            loop = asyncio.get_running_loop()
+            content_hash = await loop.run_in_executor(_IMAGE_EXECUTOR, self._digest_sync, file.file)
             
-            try:
-                # resize if needed
-                image = self.resize_image_if_needed(image)
-                
-                # convert to webp
-                image = self.convert_to_webp(image)
-                
-                # generate unique filename
-                filename = self.generate_filename(file.filename)
-                file_path = self.upload_dir / filename
-                
-                # save processed image
-                image.save(file_path, format='WEBP', quality=self.WEBP_QUALITY, optimize=True)
-                
-                logger.info(f"Successfully processed image: {filename}")
+            # generate unique filename carrying the content digest
+            filename = self.generate_filename(file.filename, content_hash)
+            file_path = self.upload_dir / filename
+            
+            # identical upload already processed, link its blob instead of re-encoding
+            if await loop.run_in_executor(_IMAGE_EXECUTOR, self._link_duplicate_sync, content_hash, file_path):
+                logger.info(f"Reused previously processed image for: {filename}")
                 return filename, str(file_path)
+            
+            buf = await loop.run_in_executor(_IMAGE_EXECUTOR, self._encode_sync, file.file)
+            
+            # save processed image via a temp file so a concurrent duplicate never links a partial write
+            tmp_path = self.upload_dir / f"{filename}.{secrets.token_hex(8)}.tmp"
+            try:
+                async with aiofiles.open(tmp_path, 'wb', buffering=self.WRITE_BUFFER_SIZE) as f:
+                    await f.write(buf.getbuffer())
+                os.replace(tmp_path, file_path)
             finally:
-                # Ensure image is closed to release file handles
-                if hasattr(image, 'close'):
-                    image.close()
+                # only still there if the write or the rename failed
+                tmp_path.unlink(missing_ok=True)
+            await loop.run_in_executor(_IMAGE_EXECUTOR, self._register_blob_sync, content_hash, file_path)
+            
+            logger.info(f"Successfully processed image: {filename}")
+            return filename, str(file_path)
             
         except HTTPException:
             raise
@@ -198,6 +340,7 @@ class ImageProcessor:
                 try:
                     file_path.unlink()
                     logger.info(f"Deleted image: {filename}")
+                    self._release_blob(filename)
                     return True
                 except PermissionError as e:
                     if attempt < max_retries - 1:
@@ -216,6 +359,26 @@ class ImageProcessor:
             logger.error(f"Error deleting image {filename}: {str(e)}")
             return False
 
+    
+    def _release_blob(self, filename: str) -> None:
+        """Remove the canonical copy of a deleted upload once no other upload links to it.
+        
+        Args:
+            filename: Name of the deleted upload
+        """
+        # "<name>_<digest>_<token>.webp"; older names carry no digest
+        parts = Path(filename).stem.rsplit('_', 2)
+        if len(parts) != 3 or len(parts[1]) != 32:
+            return
+        blob_path = self._blob_path(parts[1])
+        try:
+            # the blob's own name is the last link; an upload linking it right after
+            # still has its own link to the bytes, the next one just re-encodes
+            if blob_path.stat().st_nlink == 1:
+                blob_path.unlink()
+        except OSError:
+            pass
+
 
 # global instance
 image_processor = ImageProcessor()
\ No newline at end of file
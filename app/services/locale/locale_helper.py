@@ -1,7 +1,10 @@
 """
 Locale helper functions for extracting localized text from database models.
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Optional, Sequence
+
+# locales tried, in order, when the requested locale has no translation
+_FALLBACK_LOCALES: tuple[str, ...] = ("en", "ru", "kk")
 
 
 def get_localized_text(translations: Optional[Dict[str, str]], locale: str, fallback_text: Optional[str] = None) -> Optional[str]:
@@ -19,17 +22,14 @@ def get_localized_text(translations: Optional[Dict[str, str]], locale: str, fall
     if not translations or not isinstance(translations, dict):
         return fallback_text
     
-    # try exact locale match
-    if locale in translations:
-        return translations[locale]
-    
-    # try fallback locales in order of preference
-    fallback_locales = ["en", "ru", "kk"]
-    for fallback_locale in fallback_locales:
-        if fallback_locale in translations:
-            return translations[fallback_locale]
-    
-    # if no translations found, return fallback text
+    # exact locale match, then _FALLBACK_LOCALES in order, then the fallback text
+    value = translations.get(locale)
+    if value:
+        return value
+    for fallback_locale in _FALLBACK_LOCALES:
+        value = translations.get(fallback_locale)
+        if value:
+            return value
     return fallback_text
 
 
@@ -53,6 +53,38 @@ def get_localized_modification_type_name(modification_type, locale: str) -> str:
     return get_localized_text(modification_type.name_translations, locale, modification_type.name) or modification_type.name
 
 
+def localize_batch(items: Sequence[Any], locale: str, fields: Iterable[str]) -> None:
+    """
+    Localize fields of many rows in place, one column at a time.
+    
+    Same fallback rules as get_localized_text, but each field is resolved with a
+    few list comprehensions over the whole result set instead of one helper call
+    per row. Rows without any usable translation keep their original value.
+    
+    Args:
+        items: ORM rows (or any objects) exposing `<field>` and `<field>_translations`
+        locale: Target locale code (ru, kk, en)
+        fields: Field names to localize, e.g. ("name", "description")
+    """
+    if not items:
+        return
+    
+    for field in fields:
+        translations_attr = f"{field}_translations"
+        column = [getattr(item, translations_attr) for item in items]
+        column = [t if isinstance(t, dict) else {} for t in column]
+        
+        values = [t.get(locale) for t in column]
+        for fallback_locale in _FALLBACK_LOCALES:
+            if all(values):
+                break
+            values = [v or t.get(fallback_locale) for v, t in zip(values, column)]
+        
+        for item, value in zip(items, values):
+            if value:
+                setattr(item, field, value)
+
+
 def populate_translation_field(current_text: Optional[str], existing_translations: Optional[Dict[str, str]] = None) -> Dict[str, str]:
     """
     Populate translation field with current text as English default.
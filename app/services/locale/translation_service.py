@@ -4,10 +4,12 @@ Gemini-based translation service for automatically translating Russian text to E
 This service uses Google's Gemini AI to provide contextual translations for menu items,
 categories, and modification types when admins input data in Russian.
 """
+import asyncio
 import os
 import logging
 import json
-from typing import Dict, Optional, List
+from functools import lru_cache
+from typing import Dict, Optional, List, Tuple
 
 # Graceful handling of Gemini API imports
 try:
@@ -19,13 +21,31 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Language mapping for better prompts
+LANGUAGE_NAMES = {
+    "ru": "Russian",
+    "en": "English", 
+    "kk": "Kazakh"
+}
+
 class GeminiTranslationService:
     """Service for translating text using Google Gemini AI."""
     
+    # max cached translations, keyed by (text, target_language, source_language)
+    CACHE_SIZE = 4096
+    
+    # max texts sent to Gemini in one batch translation request
+    BATCH_SIZE = 50
+    
     def __init__(self):
         """Initialize the Gemini translation service."""
         self.model = None
         self._initialize_client()
+        
+        # failures raise inside the uncached call, so they are never cached
+        self._translate_cached = lru_cache(maxsize=self.CACHE_SIZE)(self._translate_text_uncached)
+        # completed tasks act as cached results; pending ones coalesce duplicate requests
+        self._async_cache: Dict[Tuple[str, str, str], "asyncio.Task[str]"] = {}
     
     def _initialize_client(self):
         """Initialize Gemini client if API key is available."""
@@ -38,7 +58,11 @@ class GeminiTranslationService:
             api_key = os.getenv("GEMINI_API_KEY")
             if api_key:
                 genai.configure(api_key=api_key)
-                self.model = genai.GenerativeModel('gemini-1.5-flash')
+                # temperature 0 keeps translations deterministic (and cacheable)
+                self.model = genai.GenerativeModel(
+                    'gemini-1.5-flash',
+                    generation_config={"temperature": 0.0},
+                )
                 logger.info("Gemini translation service initialized successfully")
             else:
                 logger.warning("GEMINI_API_KEY not found. Translation service disabled.")
@@ -50,10 +74,30 @@ class GeminiTranslationService:
         """Check if translation service is available."""
         return self.model is not None
     
+    def _build_prompt(self, text: str, target_language: str, source_language: str) -> str:
+        """Build the single-text translation prompt."""
+        source_lang_name = LANGUAGE_NAMES.get(source_language, source_language)
+        target_lang_name = LANGUAGE_NAMES.get(target_language, target_language)
+        
+        return f"""
+            Translate the following {source_lang_name} text to {target_lang_name}. 
+            This is for a restaurant menu, so provide culturally appropriate translations that preserve the food item's meaning.
+            Only return the translated text, nothing else.
+            
+            Text to translate: "{text}"
+            """
+    
+    def _translate_text_uncached(self, text: str, target_language: str, source_language: str) -> str:
+        """Call Gemini for a single translation; raises on failure."""
+        response = self.model.generate_content(self._build_prompt(text, target_language, source_language))
+        return response.text.strip().strip('"').strip("'")
+    
     def translate_text(self, text: str, target_language: str, source_language: str = "ru") -> Optional[str]:
         """
         Translate text from source language to target language using Gemini.
         
+        Successful translations are cached in-process.
+        
         Args:
             text: Text to translate
             target_language: Target language code (en, kk)
@@ -65,29 +109,50 @@ class GeminiTranslationService:
         if not self.model or not text or not text.strip():
             return None
         
-        # Language mapping for better prompts
-        language_names = {
-            "ru": "Russian",
-            "en": "English", 
-            "kk": "Kazakh"
-        }
+        try:
+            return self._translate_cached(text, target_language, source_language)
+        except Exception as e:
+            logger.error(f"Gemini translation failed for text '{text[:50]}...' to {target_language}: {e}")
+            return None
+    
+    async def _atranslate_text_uncached(self, text: str, target_language: str, source_language: str) -> str:
+        """Async Gemini call for a single translation; raises on failure."""
+        response = await self.model.generate_content_async(self._build_prompt(text, target_language, source_language))
+        return response.text.strip().strip('"').strip("'")
+    
+    async def atranslate_text(self, text: str, target_language: str, source_language: str = "ru") -> Optional[str]:
+        """
+        Async variant of translate_text that doesn't block the event loop.
         
-        source_lang_name = language_names.get(source_language, source_language)
-        target_lang_name = language_names.get(target_language, target_language)
+        Concurrent requests for the same text share one Gemini round trip and
+        successful results are cached in-process.
         
-        try:
-            prompt = f"""
-            Translate the following {source_lang_name} text to {target_lang_name}. 
-            This is for a restaurant menu, so provide culturally appropriate translations that preserve the food item's meaning.
-            Only return the translated text, nothing else.
-            
-            Text to translate: "{text}"
-            """
-            
-            response = self.model.generate_content(prompt)
-            return response.text.strip().strip('"').strip("'")
+        Args:
+            text: Text to translate
+            target_language: Target language code (en, kk)
+            source_language: Source language code (default: ru)
             
+        Returns:
+            Translated text or None if translation fails
+        """
+        if not self.model or not text or not text.strip():
+            return None
+        
+        # check-and-insert runs without awaiting, so it is atomic on the event loop
+        key = (text, target_language, source_language)
+        task = self._async_cache.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._atranslate_text_uncached(*key))
+            self._async_cache[key] = task
+            if len(self._async_cache) > self.CACHE_SIZE:
+                self._async_cache.pop(next(iter(self._async_cache)))
+        
+        try:
+            # shield so a cancelled caller doesn't cancel the shared request
+            return await asyncio.shield(task)
         except Exception as e:
+            if self._async_cache.get(key) is task:
+                del self._async_cache[key]
             logger.error(f"Gemini translation failed for text '{text[:50]}...' to {target_language}: {e}")
             return None
     
@@ -100,6 +165,8 @@ class GeminiTranslationService:
         """
         Translate text to multiple target languages using Gemini.
         
+        Single-text form of translate_batch, sharing its structured JSON request.
+        
         Args:
             text: Text to translate
             target_languages: List of target language codes
@@ -108,52 +175,140 @@ class GeminiTranslationService:
         Returns:
             Dictionary with language codes as keys and translations as values
         """
-        if not self.model or not text or not text.strip():
-            return {}
+        return self.translate_batch([text], target_languages, source_language)[0]
+    
+    def translate_batch(
+        self,
+        texts: List[str],
+        target_languages: List[str] = ["en", "kk"],
+        source_language: str = "ru"
+    ) -> List[Dict[str, str]]:
+        """
+        Translate many short texts with one Gemini request per BATCH_SIZE texts.
         
-        # Language mapping for better prompts
-        language_names = {
-            "ru": "Russian",
-            "en": "English", 
-            "kk": "Kazakh"
-        }
+        Args:
+            texts: Texts to translate
+            target_languages: List of target language codes
+            source_language: Source language code
+            
+        Returns:
+            One translations dict per input text (empty for blank texts or failures)
+        """
+        results: List[Dict[str, str]] = [{} for _ in texts]
+        if not self.model:
+            return results
         
-        source_lang_name = language_names.get(source_language, source_language)
-        target_lang_names = [language_names.get(lang, lang) for lang in target_languages]
+        # only send non-blank texts, remember where each one came from
+        indexes = [i for i, text in enumerate(texts) if text and text.strip()]
         
-        try:
-            prompt = f"""
-            Translate the following {source_lang_name} restaurant menu text to {', '.join(target_lang_names)}.
-            Provide culturally appropriate translations that preserve the food item's meaning.
-            Return the result as a JSON object with language codes as keys.
+        source_lang_name = LANGUAGE_NAMES.get(source_language, source_language)
+        target_lang_names = [LANGUAGE_NAMES.get(lang, lang) for lang in target_languages]
+        
+        # force a JSON array with one object per input, keyed by language code
+        generation_config = {
+            "response_mime_type": "application/json",
+            "response_schema": {
+                "type": "ARRAY",
+                "items": {
+                    "type": "OBJECT",
+                    "properties": {lang: {"type": "STRING"} for lang in target_languages},
+                    "required": list(target_languages),
+                },
+            },
+        }
+        
+        for start in range(0, len(indexes), self.BATCH_SIZE):
+            chunk = indexes[start:start + self.BATCH_SIZE]
+            chunk_texts = [texts[i] for i in chunk]
             
-            Example format: {{"en": "English translation", "kk": "Kazakh translation"}}
+            try:
+                prompt = f"""
+            Translate each of the following {source_lang_name} restaurant menu strings to {', '.join(target_lang_names)}.
+            Provide culturally appropriate translations that preserve the food item's meaning.
+            Return a JSON array with exactly one object per input string, in the same order,
+            with language codes as keys.
             
-            Text to translate: "{text}"
+            Strings to translate: {json.dumps(chunk_texts, ensure_ascii=False)}
             """
+                
+                response = self.model.generate_content(prompt, generation_config=generation_config)
+                translated = json.loads(response.text)
+                
+                if len(translated) != len(chunk):
+                    logger.error(f"Gemini batch translation returned {len(translated)} results for {len(chunk)} texts")
+                    continue
+                
+                for i, translations in zip(chunk, translated):
+                    results[i] = {lang: translations.get(lang, '') for lang in target_languages if lang in translations}
+                
+            except Exception as e:
+                logger.error(f"Gemini batch translation failed for {len(chunk)} texts: {e}")
+        
+        return results
+    
+    def batch_auto_populate(
+        self,
+        texts: List[str],
+        existing_translations: Optional[List[Optional[Dict[str, str]]]] = None
+    ) -> List[Dict[str, str]]:
+        """
+        Auto-populate translation fields for many Russian inputs at once.
+        
+        Rows missing the same languages share Gemini requests (see translate_batch).
+        
+        Args:
+            texts: Russian texts to translate
+            existing_translations: Existing translation dicts to preserve, aligned with texts
             
-            response = self.model.generate_content(prompt)
-            result_text = response.text.strip()
+        Returns:
+            Complete translation dictionaries with ru, en, and kk keys, aligned with texts
+        """
+        if existing_translations is None:
+            existing_translations = [None] * len(texts)
+        
+        rows: List[Dict[str, str]] = []
+        # needed languages -> row indexes that miss exactly those languages
+        pending: Dict[Tuple[str, ...], List[int]] = {}
+        
+        for i, (russian_text, existing) in enumerate(zip(texts, existing_translations)):
+            # Start with existing translations or empty dict
+            # Handle Mock objects in tests by ensuring we always work with a real dict
+            translations = {}
+            if existing and isinstance(existing, dict):
+                try:
+                    translations = existing.copy()
+                except (TypeError, AttributeError):
+                    # If copy fails, start with empty dict
+                    translations = {}
+            # For Mock objects or non-dict objects, just start with empty dict
             
-            # Try to parse JSON response
-            try:
-                translations = json.loads(result_text)
-                # Filter to only requested languages
-                return {lang: translations.get(lang, '') for lang in target_languages if lang in translations}
-            except json.JSONDecodeError:
-                # Fallback to individual translations if JSON parsing fails
-                logger.warning(f"Failed to parse JSON response from Gemini, falling back to individual translations")
-                translations = {}
-                for lang in target_languages:
-                    if lang != source_language:
-                        translated = self.translate_text(text, lang, source_language)
-                        if translated:
-                            translations[lang] = translated
-                return translations
+            # Always set Russian as the source
+            if russian_text and russian_text.strip():
+                translations["ru"] = russian_text.strip()
             
-        except Exception as e:
-            logger.error(f"Gemini batch translation failed for text '{text[:50]}...': {e}")
-            return {}
+            rows.append(translations)
+            
+            # Find which translations are missing
+            if self.is_available() and russian_text:
+                needed_languages = tuple(lang for lang in ("en", "kk") if lang not in translations)
+                if needed_languages:
+                    pending.setdefault(needed_languages, []).append(i)
+        
+        # Generate missing translations using Gemini
+        for needed_languages, indexes in pending.items():
+            auto_translations = self.translate_batch(
+                [texts[i] for i in indexes],
+                target_languages=list(needed_languages),
+                source_language="ru"
+            )
+            
+            # Add the new translations
+            for i, translated in zip(indexes, auto_translations):
+                for lang, translated_text in translated.items():
+                    if translated_text:
+                        rows[i][lang] = translated_text
+        
+        return rows
     
     def auto_populate_translations(
         self, 
@@ -164,7 +319,7 @@ class GeminiTranslationService:
         Auto-populate translation fields for Russian input using Gemini.
         
         This function creates translations for English and Kazakh from Russian input,
-        while preserving any existing translations.
+        while preserving any existing translations. Thin wrapper over batch_auto_populate.
         
         Args:
             russian_text: Russian text to translate
@@ -173,39 +328,7 @@ class GeminiTranslationService:
         Returns:
             Complete translation dictionary with ru, en, and kk keys
         """
-        # Start with existing translations or empty dict
-        # Handle Mock objects in tests by ensuring we always work with a real dict
-        translations = {}
-        if existing_translations and isinstance(existing_translations, dict):
-            try:
-                translations = existing_translations.copy()
-            except (TypeError, AttributeError):
-                # If copy fails, start with empty dict
-                translations = {}
-        # For Mock objects or non-dict objects, just start with empty dict
-        
-        # Always set Russian as the source
-        if russian_text and russian_text.strip():
-            translations["ru"] = russian_text.strip()
-        
-        # Generate missing translations using Gemini
-        if self.is_available() and russian_text:
-            # Find which translations are missing
-            needed_languages = [lang for lang in ["en", "kk"] if lang not in translations]
-            
-            if needed_languages:
-                auto_translations = self.translate_to_multiple_languages(
-                    russian_text, 
-                    target_languages=needed_languages, 
-                    source_language="ru"
-                )
-                
-                # Add the new translations
-                for lang, translated_text in auto_translations.items():
-                    if translated_text:
-                        translations[lang] = translated_text
-        
-        return translations
+        return self.batch_auto_populate([russian_text], [existing_translations])[0]
 
 # Global translation service instance
 gemini_translation_service = GeminiTranslationService()
@@ -1,6 +1,8 @@
 import os
+import threading
 import time
-from typing import Optional, Dict, Any, List
+from collections import OrderedDict
+from typing import Optional, Dict, Any, List, Tuple
 from functools import lru_cache
 
 import httpx
@@ -8,9 +10,64 @@ import httpx
 API_KEY = os.getenv("GOOGLE_MAPS_API_KEY_SERVER")
 GEOCODE_URL = "https://maps.googleapis.com/maps/api/geocode/json"
 
-# cache for geocoding results
-_geocode_cache: Dict[str, Dict[str, Any]] = {}
-_reverse_cache: Dict[str, Dict[str, Any]] = {}
+# shared pooled client so cache misses reuse keep-alive HTTP/2 connections;
+# created on first use and closed by close_client() on app shutdown
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=True,
+            timeout=10.0,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+        )
+    return _client
+
+
+async def close_client() -> None:
+    """close the pooled client and its connections, if one was created."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+# max entries kept per geocoding cache
+CACHE_MAXSIZE = 4096
+
+
+class _TTLCache:
+    """bounded LRU cache whose entries expire after ttl seconds."""
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Tuple, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Tuple) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry[0] >= self.ttl:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+    
+    def set(self, key: Tuple, value: Dict[str, Any]) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+# cache for geocoding results (results are treated as read-only by callers)
+_geocode_cache = _TTLCache(CACHE_MAXSIZE, 86400 * 7)  # 7 days
+_reverse_cache = _TTLCache(CACHE_MAXSIZE, 3600 * 6)  # 6 hours
 
 
 def _disabled() -> Dict[str, Any]:
@@ -31,25 +88,7 @@ def health_check() -> Dict[str, str]:
     return {"status": "configured", "api_key_prefix": api_key[:10] + "..."}
 
 
-def _get_cached_result(cache: Dict[str, Dict[str, Any]], key: str, max_age_seconds: int) -> Optional[Dict[str, Any]]:
-    """get cached result if it's still valid."""
-    if key in cache:
-        cached_data = cache[key]
-        if time.time() - cached_data.get("_cached_at", 0) < max_age_seconds:
-            result = cached_data.copy()
-            result.pop("_cached_at", None)  # Remove cache metadata
-            return result
-    return None
-
-
-def _cache_result(cache: Dict[str, Dict[str, Any]], key: str, result: Dict[str, Any]) -> None:
-    """cache result with timestamp."""
-    result_with_timestamp = result.copy()
-    result_with_timestamp["_cached_at"] = time.time()
-    cache[key] = result_with_timestamp
-
-
-def forward_geocode(
+async def forward_geocode(
     address: str,
     language: str = "ru",
     region: str = "KZ",
@@ -71,10 +110,10 @@ def forward_geocode(
         return _disabled()
     
     # create cache key
-    cache_key = f"forward:{address}:{language}:{region}:{components}:{bounds}"
+    cache_key = (address, language, region, components, bounds)
     
     # check cache first (longer cache for forward geocoding - days)
-    cached = _get_cached_result(_geocode_cache, cache_key, 86400 * 7)  # 7 days
+    cached = _geocode_cache.get(cache_key)
     if cached:
         return cached
     
@@ -99,19 +138,19 @@ def forward_geocode(
         params["bounds"] = bounds
     
     try:
-        r = httpx.get(GEOCODE_URL, params=params, timeout=10.0)
+        r = await _get_client().get(GEOCODE_URL, params=params)
         result = r.json()
         
         # cache successful results
         if result.get("status") == "OK":
-            _cache_result(_geocode_cache, cache_key, result)
+            _geocode_cache.set(cache_key, result)
         
         return result
     except Exception as e:
         return {"status": "ERROR", "error_message": f"Request failed: {str(e)}"}
 
 
-def reverse_geocode(
+async def reverse_geocode(
     lat: float,
     lng: float,
     language: str = "ru",
@@ -135,10 +174,10 @@ def reverse_geocode(
         return _disabled()
     
     # create cache key
-    cache_key = f"reverse:{lat}:{lng}:{language}:{region}:{result_type}:{location_type}"
+    cache_key = (lat, lng, language, region, result_type, location_type)
     
     # check cache first (shorter cache for reverse geocoding - hours)
-    cached = _get_cached_result(_reverse_cache, cache_key, 3600 * 6)  # 6 hours
+    cached = _reverse_cache.get(cache_key)
     if cached:
         return cached
     
@@ -158,12 +197,12 @@ def reverse_geocode(
         params["location_type"] = location_type
     
     try:
-        r = httpx.get(GEOCODE_URL, params=params, timeout=10.0)
+        r = await _get_client().get(GEOCODE_URL, params=params)
         result = r.json()
         
         # cache successful results
         if result.get("status") == "OK":
-            _cache_result(_reverse_cache, cache_key, result)
+            _reverse_cache.set(cache_key, result)
         
         return result
     except Exception as e:
@@ -224,6 +263,6 @@ def is_valid_fallback_address(typed_address: str, components: Dict[str, str]) ->
 
 
 # legacy function for backward compatibility - will be deprecated
-def geocode(address: str, lang: Optional[str] = None) -> Dict[str, Any]:
+async def geocode(address: str, lang: Optional[str] = None) -> Dict[str, Any]:
     """legacy geocode function. Use forward_geocode instead."""
-    return forward_geocode(address, language=lang or "ru")
+    return await forward_geocode(address, language=lang or "ru")
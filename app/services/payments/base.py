@@ -1,8 +1,10 @@
 from typing import Any, Dict
 import hmac
-import hashlib
 import os
 
+# read once at import; hmac.digest() below is the one-shot C fast path
+_WEBHOOK_SECRET = (os.getenv("WEBHOOK_SECRET", "") or "").encode()
+
 
 class PaymentsProvider:
     """base payments provider interface (architecture-ready)."""
@@ -12,8 +14,7 @@ class PaymentsProvider:
 
     @staticmethod
     def verify_signature(body: bytes, signature: str) -> bool:
-        secret = (os.getenv("WEBHOOK_SECRET", "") or "").encode()
-        computed = hmac.new(secret, body, hashlib.sha256).hexdigest()
+        computed = hmac.digest(_WEBHOOK_SECRET, body, "sha256").hex()
         try:
             return hmac.compare_digest(computed, signature)
         except Exception:
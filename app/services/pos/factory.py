@@ -1,11 +1,17 @@
 import os
+from functools import lru_cache
 from .base import POSAdapter
 from .mock import MockPOS
 
 
-def get_pos_adapter() -> POSAdapter:
-    provider = os.getenv("POS_PROVIDER", "mock").lower()
+@lru_cache(maxsize=None)
+def _get_pos_adapter_cached(provider: str) -> POSAdapter:
+    # one adapter per provider per process (real adapters hold pools/tokens)
     if provider == "mock":
         return MockPOS()
     # default to mock for MVP
     return MockPOS()
+
+
+def get_pos_adapter() -> POSAdapter:
+    return _get_pos_adapter_cached(os.getenv("POS_PROVIDER", "mock").lower())
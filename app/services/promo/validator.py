@@ -2,15 +2,87 @@ from datetime import datetime
 from typing import Optional
 from decimal import Decimal
 
+from sqlalchemy import bindparam, select
 from sqlalchemy.orm import Session
 
 from app import models
 
 
+_D0 = Decimal("0")
+_D100 = Decimal("100")
+_Q = Decimal("0.01")
+
+# marks codes not looked up yet in this session's promo cache
+_MISSING = object()
+
+# built once so SQLAlchemy's compiled-statement cache reuses the same SQL
+_PROMO_STMT = select(models.Promocode).where(models.Promocode.code == bindparam("code")).limit(1)
+
+
+# process-wide code -> primary key map; hits go through Session.get and the identity map
+_PROMO_IDS: dict[str, int] = {}
+
+
+def _select_promo(db: Session, code: str) -> Optional[models.Promocode]:
+    pk = _PROMO_IDS.get(code)
+    if pk is not None:
+        promo = db.get(models.Promocode, pk)
+        # the row may have been deleted or renamed by another worker
+        if promo is not None and promo.code == code:
+            return promo
+        _PROMO_IDS.pop(code, None)
+
+    promo = db.execute(_PROMO_STMT, {"code": code}).scalar_one_or_none()
+    if promo is not None:
+        _PROMO_IDS[code] = promo.id
+    return promo
+
+
+def load_promo(db: Session, code: str, cache: bool = True) -> Optional[models.Promocode]:
+    """load a promocode by code, memoized in db.info for the lifetime of the session.
+
+    Sessions are per request, so cart preview and checkout validating the same
+    code within one request share a single SELECT. Pass cache=False to bypass.
+    """
+    info = getattr(db, "info", None)
+    if not isinstance(info, dict):
+        # mocked sessions in tests only stub the legacy Query API
+        return db.query(models.Promocode).filter(models.Promocode.code == code).first()
+    if not cache:
+        return _select_promo(db, code)
+
+    promo_cache = info.setdefault("promo_cache", {})
+    promo = promo_cache.get(code, _MISSING)
+    if promo is _MISSING:
+        promo = _select_promo(db, code)
+        promo_cache[code] = promo
+    return promo
+
+
+def invalidate_promo(db: Session, code: str) -> None:
+    """drop a code from the session's promo cache after it was changed or deleted."""
+    _PROMO_IDS.pop(code, None)
+    info = getattr(db, "info", None)
+    if isinstance(info, dict):
+        info.get("promo_cache", {}).pop(code, None)
+
+
+def _as_decimal(value) -> Decimal:
+    # Numeric columns already load as Decimal; only freshly assigned floats need parsing
+    return value if isinstance(value, Decimal) else Decimal(str(value))
+
+
+# discount for each promo kind as fn(subtotal, value)
+_DISCOUNT_FNS = {
+    "percent": lambda subtotal, value: (subtotal * value / _D100).quantize(_Q),
+    "amount": lambda subtotal, value: value,
+}
+
+
 class PromoValidationResult:
-    def __init__(self, valid: bool, discount: Decimal = Decimal('0.0'), reason: Optional[str] = None):
+    def __init__(self, valid: bool, discount: Decimal = _D0, reason: Optional[str] = None):
         self.valid = valid
-        self.discount = Decimal(str(discount))
+        self.discount = _as_decimal(discount)
         self.reason = reason
 
     def dict(self):
@@ -19,28 +91,30 @@ class PromoValidationResult:
 
 def calculate_discount(db: Session, code: Optional[str], subtotal: Decimal, user_id: Optional[int] = None) -> PromoValidationResult:
     if not code:
-        return PromoValidationResult(valid=True, discount=Decimal('0.0'))
+        return PromoValidationResult(valid=True, discount=_D0)
 
-    promo: models.Promocode | None = db.query(models.Promocode).filter(models.Promocode.code == code).first()
+    promo: models.Promocode | None = load_promo(db, code)
     if not promo or not promo.is_active:
         return PromoValidationResult(valid=False, reason="invalid_or_inactive")
 
-    now = datetime.utcnow()
-    if promo.valid_from and now < promo.valid_from:
-        return PromoValidationResult(valid=False, reason="not_started")
-    if promo.valid_to and now > promo.valid_to:
-        return PromoValidationResult(valid=False, reason="expired")
+    # most codes have no validity window, only read the clock when one is set
+    valid_from, valid_to = promo.valid_from, promo.valid_to
+    if valid_from or valid_to:
+        now = datetime.utcnow()
+        if valid_from and now < valid_from:
+            return PromoValidationResult(valid=False, reason="not_started")
+        if valid_to and now > valid_to:
+            return PromoValidationResult(valid=False, reason="expired")
 
-    if promo.min_subtotal is not None and subtotal < Decimal(str(promo.min_subtotal)):
+    # read the Numeric column directly, the min_subtotal alias converts it to float
+    min_order_amount = promo.min_order_amount
+    if min_order_amount is not None and subtotal < _as_decimal(min_order_amount):
         return PromoValidationResult(valid=False, reason="min_subtotal_not_met")
 
     # note: max_redemptions and per_user_limit aren't tracked in MVP without redemption logs
     # apply discount
-    discount = Decimal('0.0')
-    if promo.kind == "percent":
-        discount = (subtotal * Decimal(str(promo.value)) / Decimal('100')).quantize(Decimal('0.01'))
-    elif promo.kind == "amount":
-        discount = Decimal(str(promo.value))
+    fn = _DISCOUNT_FNS.get(promo.kind)
+    discount = fn(subtotal, _as_decimal(promo.value)) if fn else _D0
 
     # ensure non-negative total
     discount = min(discount, subtotal)
@@ -52,7 +126,7 @@ def is_promo_valid(promo_code: str, order_total: float = 0.0, db: Session = None
     if not promo_code or db is None:
         return False
     
-    promo = db.query(models.Promocode).filter(models.Promocode.code == promo_code).first()
+    promo = load_promo(db, promo_code)
     if not promo or not promo.is_active:
         return False
     
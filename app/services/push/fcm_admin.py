@@ -1,5 +1,10 @@
 import os
 import logging
+import secrets
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from typing import Optional, Dict, List, Union
 from datetime import datetime, timedelta
 
@@ -14,8 +19,30 @@ except Exception:  # pragma: no cover
 logger = logging.getLogger(__name__)
 _initialized = False
 
+# max send_each calls (one HTTP/2 connection each) in flight per send_batch
+MAX_PARALLEL_BATCHES = 8
 
-def _ensure_init():
+# topic every registered device is subscribed to (Device.topic_subscribed tracks it);
+# pushes addressed to every device go through it once the audience is this large
+ALL_DEVICES_TOPIC = "all_devices"
+TOPIC_FANOUT_THRESHOLD = 10_000
+
+# FCM accepts at most this many tokens per (un)subscribe call
+TOPIC_BATCH_LIMIT = 1000
+
+# fanouts above this many tokens should go through send_batch_async
+SYNC_BATCH_LIMIT = 500
+
+# background fanout jobs; each job fans out to MAX_PARALLEL_BATCHES connections itself
+_BATCH_JOB_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="fcm-batch")
+# most recent jobs kept for status polling
+MAX_TRACKED_JOBS = 256
+_batch_jobs: "OrderedDict[str, Future]" = OrderedDict()
+_batch_jobs_lock = threading.Lock()
+
+
+def _ensure_init(strict: bool = False):
+    """initialize the client once; called from app startup (strict=True re-raises init errors)."""
     global _initialized
     if _initialized:
         return
@@ -30,10 +57,33 @@ def _ensure_init():
             firebase_admin.initialize_app(cred)
         _initialized = True
     except Exception:
+        if strict:
+            # credentials are present but broken, fail fast at startup
+            raise
         # leave uninitd for graceful no-op
         _initialized = False
 
 
+@lru_cache(maxsize=64)
+def _android_config(priority: str, ttl: Optional[int]):
+    """shared AndroidConfig per (priority, ttl); messages only read it."""
+    return messaging.AndroidConfig(
+        priority=priority,
+        ttl=timedelta(seconds=ttl) if ttl else None,
+    )
+
+
+@lru_cache(maxsize=64)
+def _notification(title: str, body: str):
+    """shared Notification per (title, body), reused across sends of the same push."""
+    return messaging.Notification(title=title, body=body)
+
+
+def _data_payload(data: Optional[Dict[str, str]]) -> Dict[str, str]:
+    """FCM data values must be strings."""
+    return {k: str(v) for k, v in data.items()} if data else {}
+
+
 def health_check() -> Dict[str, str]:
     """check FCM integration health and config status."""
     if firebase_admin is None or credentials is None:
@@ -78,41 +128,51 @@ def send_to_token(
     Returns:
         Dict with status, message_id (if successful), or error details
     """
-    _ensure_init()
     if messaging is None or not _initialized:
         logger.warning("FCM not configured, skipping token send")
         return {"status": "skipped", "reason": "fcm_not_configured"}
     
     try:
+        message_id = _send_fast(token, title, body, data, priority, ttl)
+    except Exception as e:
+        return _token_send_error(token, e)
+    
+    logger.info(f"FCM message sent successfully: {message_id}")
+    return {"status": "sent", "id": message_id, "timestamp": datetime.utcnow().isoformat()}
+
+
+def _send_fast(
+    token: str,
+    title: str,
+    body: str,
+    data: Optional[Dict[str, str]],
+    priority: str,
+    ttl: Optional[int]
+) -> str:
+    """build and send a single-token message, returning the message id (errors propagate)."""
+    msg = messaging.Message(
+        token=token,
+        notification=_notification(title, body),
+        data=_data_payload(data),
         # build Android config (Android-only)
-        android_config = messaging.AndroidConfig(
-            priority=priority,
-            ttl=timedelta(seconds=ttl) if ttl else None,
-        )
-        
-        msg = messaging.Message(
-            token=token,
-            notification=messaging.Notification(title=title, body=body),
-            data={k: str(v) for k, v in (data or {}).items()},
-            android=android_config,
-        )
-        
-        message_id = messaging.send(msg)
-        logger.info(f"FCM message sent successfully: {message_id}")
-        return {"status": "sent", "id": message_id, "timestamp": datetime.utcnow().isoformat()}
-        
-    except messaging.UnregisteredError:
+        android=_android_config(priority, ttl),
+    )
+    return messaging.send(msg)
+
+
+def _token_send_error(token: str, e: Exception) -> Dict[str, str]:
+    """map an FCM send exception to the error result; stale tokens are the common case."""
+    if isinstance(e, messaging.UnregisteredError):
         logger.warning(f"FCM token is unregistered: {token[:20]}...")
         return {"status": "error", "reason": "token_unregistered", "error": "Token is no longer valid"}
-    except messaging.SenderIdMismatchError:
+    if isinstance(e, messaging.SenderIdMismatchError):
         logger.error(f"FCM sender ID mismatch for token: {token[:20]}...")
         return {"status": "error", "reason": "sender_id_mismatch", "error": "Invalid sender ID"}
-    except messaging.QuotaExceededError:
+    if isinstance(e, messaging.QuotaExceededError):
         logger.error("FCM quota exceeded")
         return {"status": "error", "reason": "quota_exceeded", "error": "FCM quota exceeded"}
-    except Exception as e:
-        logger.error(f"FCM send failed: {str(e)}")
-        return {"status": "error", "reason": "send_failed", "error": str(e)}
+    logger.error(f"FCM send failed: {str(e)}")
+    return {"status": "error", "reason": "send_failed", "error": str(e)}
 
 
 def send_batch(
@@ -122,7 +182,7 @@ def send_batch(
     data: Optional[Dict[str, str]] = None,
     priority: str = "normal",
     ttl: Optional[int] = None,
-    batch_size: int = 500
+    batch_size: int = 100
 ) -> Dict[str, Union[str, int, List]]:
     """
     Send push notifications to multiple FCM tokens in batches.
@@ -134,12 +194,12 @@ def send_batch(
         data: Optional custom data payload
         priority: Message priority (normal|high)
         ttl: Time to live in seconds
-        batch_size: Maximum batch size (FCM limit is 500)
+        batch_size: Messages per send_each call (FCM limit is 500; 100 keeps
+            one HTTP/2 stream per message on a single connection)
     
     Returns:
         Dict with overall status, success/failure counts, and detailed results
     """
-    _ensure_init()
     if messaging is None or not _initialized:
         logger.warning("FCM not configured, skipping batch send")
         return {"status": "skipped", "reason": "fcm_not_configured", "sent": 0, "failed": len(tokens)}
@@ -157,55 +217,66 @@ def send_batch(
     
     try:
         # build Android config (Android-only)
-        android_config = messaging.AndroidConfig(
-            priority=priority,
-            ttl=timedelta(seconds=ttl) if ttl else None,
-        )
+        android_config = _android_config(priority, ttl)
         
-        # process tokens in batches
-        for i in range(0, len(tokens), batch_size):
-            batch_tokens = tokens[i:i + batch_size]
-            
-            # create multicast message for this batch
-            multicast = messaging.MulticastMessage(
-                tokens=batch_tokens,
-                notification=messaging.Notification(title=title, body=body),
-                data={k: str(v) for k, v in (data or {}).items()},
-                android=android_config,
-            )
+        notification = _notification(title, body)
+        # built once per call, every batch shares it
+        payload = _data_payload(data)
+        
+        def _send_one_batch(batch_no: int, batch: range):
+            """send tokens[batch]; returns (sent, message_ids, failed_tokens)."""
+            # one message per token; send_each multiplexes them over HTTP/2
+            # (send_multicast is deprecated)
+            messages = [
+                messaging.Message(
+                    token=tokens[idx],
+                    notification=notification,
+                    data=payload,
+                    android=android_config,
+                )
+                for idx in batch
+            ]
+            ids: List[str] = []
+            failed: List[Dict[str, str]] = []
             
             try:
                 # send batch
-                response = messaging.send_multicast(multicast)
+                response = messaging.send_each(messages)
                 # compute success/failure counts robustly and cap to batch size
                 if hasattr(response, "responses") and response.responses is not None:
                     succ = sum(1 for r in response.responses if getattr(r, "success", False))
                 else:
-                    succ = min(getattr(response, "success_count", 0), len(batch_tokens))
-                fail = len(batch_tokens) - succ
-                total_sent += succ
-                total_failed += fail
+                    succ = min(getattr(response, "success_count", 0), len(batch))
                 
                 # collect individual results
-                for j, res in enumerate(response.responses):
+                for idx, res in zip(batch, response.responses):
                     if res.success:
-                        message_ids.append(getattr(res, "message_id", None) or "")
+                        ids.append(getattr(res, "message_id", None) or "")
                     else:
                         err = str(getattr(res, "exception", "unknown error"))
                         if hasattr(messaging, "UnregisteredError") and isinstance(getattr(res, "exception", None), messaging.UnregisteredError):
-                            logger.warning(f"Unregistered token in batch: {batch_tokens[j][:20]}...")
-                        failed_tokens.append({"token": batch_tokens[j], "error": err})
+                            logger.warning(f"Unregistered token in batch: {tokens[idx][:20]}...")
+                        failed.append({"token": tokens[idx], "error": err})
                 
-                logger.info(f"Batch {i//batch_size + 1} sent: {response.success_count}/{len(batch_tokens)}")
+                logger.info(f"Batch {batch_no} sent: {succ}/{len(batch)}")
+                return succ, ids, failed
                 
             except Exception as e:
-                logger.error(f"Batch {i//batch_size + 1} failed: {str(e)}")
-                total_failed += len(batch_tokens)
-                for token in batch_tokens:
-                    failed_tokens.append({
-                        "token": token,
-                        "error": str(e)
-                    })
+                logger.error(f"Batch {batch_no} failed: {str(e)}")
+                return 0, ids, [{"token": tokens[idx], "error": str(e)} for idx in batch]
+        
+        # overlap batch round trips on a few parallel HTTP/2 connections
+        # index ranges instead of slices, so no per-batch copy of the token list
+        chunks = [range(i, min(i + batch_size, len(tokens))) for i in range(0, len(tokens), batch_size)]
+        with ThreadPoolExecutor(max_workers=min(MAX_PARALLEL_BATCHES, len(chunks))) as ex:
+            futures = [ex.submit(_send_one_batch, n, chunk) for n, chunk in enumerate(chunks, 1)]
+            # collect in submission order so results line up with the input tokens
+            for chunk, future in zip(chunks, futures):
+                succ, ids, failed = future.result()
+                total_sent += succ
+                total_failed += len(chunk) - succ
+                message_ids.extend(ids)
+                failed_tokens.extend(failed)
         
         logger.info(f"Batch send completed: {total_sent} sent, {total_failed} failed")
         status = "sent" if total_failed == 0 else ("partial" if total_sent > 0 else "failed")
@@ -229,6 +300,41 @@ def send_batch(
         }
 
 
+def send_batch_async(tokens: List[str], *args, **kwargs) -> str:
+    """
+    Queue send_batch on a background pool so the caller doesn't wait for the fanout.
+    
+    Args:
+        tokens: List of FCM registration tokens
+        *args, **kwargs: Forwarded to send_batch
+    
+    Returns:
+        Job id to poll with get_batch_job
+    """
+    job_id = secrets.token_hex(8)
+    future = _BATCH_JOB_EXECUTOR.submit(send_batch, tokens, *args, **kwargs)
+    with _batch_jobs_lock:
+        _batch_jobs[job_id] = future
+        while len(_batch_jobs) > MAX_TRACKED_JOBS:
+            _batch_jobs.popitem(last=False)
+    logger.info(f"Queued FCM batch job {job_id} for {len(tokens)} tokens")
+    return job_id
+
+
+def get_batch_job(job_id: str) -> Optional[Dict[str, Union[str, int, List]]]:
+    """status of a queued batch job: send_batch's result once done, None if unknown."""
+    with _batch_jobs_lock:
+        future = _batch_jobs.get(job_id)
+    if future is None:
+        return None
+    if not future.done():
+        return {"status": "running" if future.running() else "queued", "job_id": job_id}
+    exc = future.exception()
+    if exc is not None:
+        return {"status": "error", "reason": "batch_job_failed", "error": str(exc), "job_id": job_id}
+    return {**future.result(), "job_id": job_id}
+
+
 def send_to_topic(
     topic: str,
     title: str,
@@ -251,22 +357,18 @@ def send_to_topic(
     Returns:
         Dict with status, message_id (if successful), or error details
     """
-    _ensure_init()
     if messaging is None or not _initialized:
         logger.warning("FCM not configured, skipping topic send")
         return {"status": "skipped", "reason": "fcm_not_configured"}
     
     try:
         # build Android config (Android-only)
-        android_config = messaging.AndroidConfig(
-            priority=priority,
-            ttl=timedelta(seconds=ttl) if ttl else None,
-        )
+        android_config = _android_config(priority, ttl)
         
         msg = messaging.Message(
             topic=topic,
-            notification=messaging.Notification(title=title, body=body),
-            data={k: str(v) for k, v in (data or {}).items()},
+            notification=_notification(title, body),
+            data=_data_payload(data),
             android=android_config,
         )
         
@@ -290,7 +392,6 @@ def subscribe_to_topic(tokens: List[str], topic: str) -> Dict[str, Union[str, in
     Returns:
         Dict with status and subscription results
     """
-    _ensure_init()
     if messaging is None or not _initialized:
         logger.warning("FCM not configured, skipping topic subscription")
         return {"status": "skipped", "reason": "fcm_not_configured"}
@@ -310,7 +411,9 @@ def subscribe_to_topic(tokens: List[str], topic: str) -> Dict[str, Union[str, in
             "status": status,
             "success_count": succ,
             "failure_count": fail,
-            "errors": [str(error.reason) for error in getattr(response, "errors", [])] if getattr(response, "errors", None) else []
+            "errors": [str(error.reason) for error in getattr(response, "errors", [])] if getattr(response, "errors", None) else [],
+            # tokens that were not subscribed, so callers only mark the rest
+            "failed_tokens": [tokens[error.index] for error in getattr(response, "errors", None) or []]
         }
         
     except Exception as e:
@@ -329,7 +432,6 @@ def unsubscribe_from_topic(tokens: List[str], topic: str) -> Dict[str, Union[str
     Returns:
         Dict with status and unsubscription results
     """
-    _ensure_init()
     if messaging is None or not _initialized:
         logger.warning("FCM not configured, skipping topic unsubscription")
         return {"status": "skipped", "reason": "fcm_not_configured"}
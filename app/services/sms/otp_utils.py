@@ -1,10 +1,19 @@
 import hashlib
+import re
 import secrets
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Tuple
 
 from app.core.config import settings
 
+# +XXX-XXX-XXXX (area code with dashes but no parentheses/spaces)
+_US_DASHED = re.compile(r'^\+\d{3}-\d{3}-\d{4}$')
+# formatting characters a number without a leading + must contain
+_FMT_CHARS = frozenset(" ()-")
+# strips the same formatting characters in a single pass
+_DEL_TABLE = str.maketrans("", "", " -()")
+
 
 def generate_otp_data() -> Tuple[str, str, str, str, datetime]:
     """
@@ -15,11 +24,14 @@ def generate_otp_data() -> Tuple[str, str, str, str, datetime]:
     """
     # generate token (for potential future use) and 6-digit code
     raw_token = secrets.token_hex(16)
-    raw_code = f"{secrets.randbelow(1000000):06d}"
+    # one 64-bit CSPRNG read instead of randbelow's rejection loop; modulo bias
+    # over 2**64 -> 10**6 is ~5e-14, far below what OTP rate limits could observe
+    raw_code = f"{int.from_bytes(secrets.token_bytes(8), 'big') % 1_000_000:06d}"
     
-    # hash both for secure storage
+    # hash both for secure storage; the code goes through hash_code's LRU so
+    # verifying the correct code later is a cache hit
     token_hash = _sha256(raw_token)
-    code_hash = _sha256(raw_code)
+    code_hash = hash_code(raw_code)
     
     # set expiration time
     expires_at = datetime.now(tz=timezone.utc) + timedelta(
@@ -29,14 +41,18 @@ def generate_otp_data() -> Tuple[str, str, str, str, datetime]:
     return raw_token, raw_code, token_hash, code_hash, expires_at
 
 
+@lru_cache(maxsize=4096)
 def hash_code(code: str) -> str:
     """hash an OTP code for secure storage and verification."""
-    return _sha256(code)
+    # the 6-digit code space is small and wrong codes get retried, so repeats are common
+    # (utf-8 here: isdigit() also accepts non-ascii digits from user input)
+    return hashlib.sha256(code.encode("utf-8")).hexdigest()
 
 
 def _sha256(s: str) -> str:
-    """helper function to generate SHA256 hash."""
-    return hashlib.sha256(s.encode("utf-8")).hexdigest()
+    """helper function to generate SHA256 hash of generated (ascii-only) tokens."""
+    # ascii encodes faster than utf-8 and yields identical bytes for hex/digit strings
+    return hashlib.sha256(s.encode("ascii")).hexdigest()
 
 
 def format_phone_number(phone: str) -> str:
@@ -51,13 +67,10 @@ def format_phone_number(phone: str) -> str:
         Formatted phone number
     """
     # remove common formatting characters
-    clean = phone.replace(" ", "").replace("-", "").replace("(", "").replace(")", "")
+    clean = phone.translate(_DEL_TABLE)
     
     # ensure it starts with +
-    if not clean.startswith("+"):
-        clean = "+" + clean
-    
-    return clean
+    return clean if clean.startswith("+") else "+" + clean
 
 
 def validate_phone_format(phone: str) -> bool:
@@ -83,22 +96,19 @@ def validate_phone_format(phone: str) -> bool:
         if phone.isdigit():
             return False
         # must have formatting characters like spaces, parentheses, or dashes to be valid
-        formatting_chars = {' ', '(', ')', '-'}
-        if not any(char in phone for char in formatting_chars):
+        if not any(c in _FMT_CHARS for c in phone):
             return False
     
     # for phones that already start with +, check for specific invalid patterns
     # let format_phone_number handle most cleaning, but reject obvious invalid patterns
     if phone.startswith("+"):
         # remove + and check if the remaining part contains letters (clearly invalid)
-        remaining = phone[1:].replace(" ", "").replace("(", "").replace(")", "").replace("-", "")
+        remaining = phone[1:].translate(_DEL_TABLE)
         if not remaining.isdigit():
             return False
         
         # reject specific invalid dash patterns like "+123-456-7890" (US format with dashes)
-        import re
-        # pattern for +XXX-XXX-XXXX (area code with dashes but no parentheses/spaces)
-        if re.match(r'^\+\d{3}-\d{3}-\d{4}$', phone):
+        if _US_DASHED.match(phone):
             return False
     
     # clean the phone number using format_phone_number
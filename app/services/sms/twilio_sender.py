@@ -4,17 +4,34 @@ from typing import Optional, Dict
 try:
     from twilio.rest import Client  # type: ignore
     from twilio.base.exceptions import TwilioRestException  # type: ignore
+    from twilio.http.http_client import TwilioHttpClient  # type: ignore
+    from requests.adapters import HTTPAdapter  # type: ignore
 except Exception:  # pragma: no cover
     Client = None
     TwilioRestException = None
+    TwilioHttpClient = None
+    HTTPAdapter = None
 
 from app.core.config import settings
 
 _initialized = False
 _client: Optional[Client] = None
 
+# keep-alive pool for Twilio API calls (requests defaults to 10 per host)
+POOL_CONNECTIONS = 32
+POOL_MAXSIZE = 64
 
-def _ensure_init():
+
+def _pooled_http_client():
+    """twilio http client whose session keeps up to POOL_MAXSIZE connections alive."""
+    http = TwilioHttpClient(pool_connections=True)
+    adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE)
+    http.session.mount("https://", adapter)
+    return http
+
+
+def _ensure_init(strict: bool = False):
+    """initialize the client once; called from app startup (strict=True re-raises init errors)."""
     global _initialized, _client
     if _initialized:
         return
@@ -25,9 +42,12 @@ def _ensure_init():
         auth_token = os.getenv("TWILIO_AUTH_TOKEN")
         if not account_sid or not auth_token:
             return
-        _client = Client(account_sid, auth_token)
+        _client = Client(account_sid, auth_token, http_client=_pooled_http_client())
         _initialized = True
     except Exception:
+        if strict:
+            # credentials are present but broken, fail fast at startup
+            raise
         # leave uninitd for graceful no-op
         _initialized = False
         _client = None
@@ -69,7 +89,6 @@ def start_verification(to_number: str, channel: str = "sms") -> Dict[str, str]:
     --data-urlencode "Channel=sms" \
     -u $TWILIO_ACCOUNT_SID:$TWILIO_AUTH_TOKEN
     """
-    _ensure_init()
     if not _initialized or not _client:
         return {"status": "skipped", "reason": "twilio_not_configured"}
     
@@ -98,7 +117,6 @@ def check_verification(to_number: str, code: str) -> Dict[str, str]:
     --data-urlencode "Code=1234567" \
     -u $TWILIO_ACCOUNT_SID:$TWILIO_AUTH_TOKEN
     """
-    _ensure_init()
     if not _initialized or not _client:
         return {"status": "skipped", "reason": "twilio_not_configured"}
     
@@ -125,7 +143,6 @@ def check_verification(to_number: str, code: str) -> Dict[str, str]:
 
 def send_sms(to_number: str, body: str) -> Dict[str, str]:
     """send SMS message to a phone number (legacy function for backwards compatibility)."""
-    _ensure_init()
     if not _initialized or not _client:
         return {"status": "skipped", "reason": "sms_not_configured"}
     
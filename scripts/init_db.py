@@ -11,11 +11,11 @@ Usage:
     python scripts/init_db.py [--seed-data] [--force-recreate]
 """
 
-import os
 import sys
 import argparse
-import subprocess
+import json
 from pathlib import Path
+from urllib.parse import urlparse
 
 # add project root to Python path
 project_root = Path(__file__).parent.parent
@@ -23,7 +23,7 @@ sys.path.insert(0, str(project_root))
 
 from app.core.config import settings
 from app.db.session import engine, SessionLocal
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, insert, text
 import logging
 
 # configure logging
@@ -33,6 +33,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# fixed SQL built once at import instead of per call
+_COMMIT = text("COMMIT")
+_PG_DB_EXISTS = text("SELECT 1 FROM pg_database WHERE datname = :db_name")
+_SELECT_1 = text("SELECT 1")
+_SYNC_COMMIT_OFF = text("SET LOCAL synchronous_commit = off")
+
 
 def create_database_if_not_exists():
     """create db if it doesn't exist (PostgreSQL only)."""
@@ -44,7 +50,6 @@ def create_database_if_not_exists():
     
     try:
         # parse db URL to get db name
-        from urllib.parse import urlparse
         parsed = urlparse(database_url)
         database_name = parsed.path[1:]  # Remove leading '/'
         
@@ -55,9 +60,9 @@ def create_database_if_not_exists():
         
         # check if db exists
         with postgres_engine.connect() as conn:
-            conn.execute(text("COMMIT"))  # End any existing transaction
+            conn.execute(_COMMIT)  # End any existing transaction
             result = conn.execute(
-                text("SELECT 1 FROM pg_database WHERE datname = :db_name"),
+                _PG_DB_EXISTS,
                 {"db_name": database_name}
             )
             
@@ -82,31 +87,32 @@ def run_migrations():
     try:
         logger.info("Running Alembic migrations...")
         
-        # change to project root directory
-        os.chdir(project_root)
+        # in-process alembic API, no interpreter startup or second DB connection setup
+        from alembic import command
+        from alembic.config import Config
+        from alembic.util.exc import CommandError
         
-        # run alembic upgrade head
-        subprocess.run(
-            [sys.executable, "-m", "alembic", "stamp", "head"],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-
-        result = subprocess.run(
-            [sys.executable, "-m", "alembic", "upgrade", "head"],
-            capture_output=True,
-            text=True,
-            check=True
-        )
+        cfg = Config(str(project_root / "alembic.ini"))
+        cfg.set_main_option("script_location", str(project_root / "alembic"))
+        # keep this script's logging setup, env.py would otherwise fileConfig() over it
+        cfg.attributes["configure_logger"] = False
+        
+        try:
+            command.stamp(cfg, "head")
+            command.upgrade(cfg, "head")
+        except CommandError as e:
+            logger.error(f"Error running migrations: {e}")
+            return False
+        except Exception as e:
+            # SQLAlchemy/driver errors raised by a migration itself
+            logger.error(f"Migration failed: {e}")
+            return False
         
         logger.info("Migrations completed successfully")
-        logger.debug(f"Migration output: {result.stdout}")
         return True
         
-    except subprocess.CalledProcessError as e:
-        logger.error(f"Error running migrations: {e}")
-        logger.error(f"Migration error output: {e.stderr}")
+    except ImportError as e:
+        logger.error(f"Import error running migrations: {e}")
         return False
 
 
@@ -126,46 +132,25 @@ def delete_all_data():
             logger.error(f"Import error during data deletion: {e}")
             return False
         
+        # child tables first, then parent tables
+        models_in_order = [
+            OrderItem, Order, SavedAddress, Device, EmailVerification, PhoneVerification,
+            EmailEvent, MenuItem, User, Category, Promocode, PromoBatch
+        ]
+        
         db = SessionLocal()
         try:
-            # delete in order respecting foreign key constraints
-            # child tables first, then parent tables
-            
-            logger.info("Deleting order items...")
-            db.query(OrderItem).delete()
-            
-            logger.info("Deleting orders...")
-            db.query(Order).delete()
-            
-            logger.info("Deleting saved addresses...")
-            db.query(SavedAddress).delete()
-            
-            logger.info("Deleting devices...")
-            db.query(Device).delete()
-            
-            logger.info("Deleting email verifications...")
-            db.query(EmailVerification).delete()
-            
-            logger.info("Deleting phone verifications...")
-            db.query(PhoneVerification).delete()
-            
-            logger.info("Deleting email events...")
-            db.query(EmailEvent).delete()
-            
-            logger.info("Deleting menu items...")
-            db.query(MenuItem).delete()
-            
-            logger.info("Deleting users...")
-            db.query(User).delete()
-            
-            logger.info("Deleting categories...")
-            db.query(Category).delete()
-            
-            logger.info("Deleting promocodes...")
-            db.query(Promocode).delete()
+            if settings.DATABASE_URL.startswith("postgresql"):
+                # one statement, no per-row MVCC work, and sequences start over
+                tables = ", ".join(model.__tablename__ for model in models_in_order)
+                db.execute(text(f"TRUNCATE TABLE {tables} RESTART IDENTITY CASCADE"))
+                db.commit()
+                logger.info(f"Truncated {len(models_in_order)} tables")
+                return True
             
-            logger.info("Deleting promo batches...")
-            db.query(PromoBatch).delete()
+            # no TRUNCATE elsewhere (e.g. SQLite): delete in order respecting foreign key constraints
+            for model in models_in_order:
+                db.query(model).delete()
             
             db.commit()
             logger.info("All existing data deleted successfully")
@@ -183,6 +168,23 @@ def delete_all_data():
         return False
 
 
+def copy_rows(db, table, rows):
+    """bulk load dict rows into table with PostgreSQL COPY, inside the session's transaction."""
+    if not rows:
+        return
+    cols = list(rows[0])
+    # psycopg 3 connection behind the session's current connection
+    raw_conn = db.connection().connection.driver_connection
+    with raw_conn.cursor() as cur:
+        with cur.copy(f"COPY {table} ({', '.join(cols)}) FROM STDIN") as copy:
+            for row in rows:
+                # JSON columns (translations) go over the wire as their text form
+                copy.write_row([
+                    json.dumps(row[col], ensure_ascii=False) if isinstance(row[col], dict) else row[col]
+                    for col in cols
+                ])
+
+
 def seed_initial_data():
     """delete all data, run migrations, and seed initial data (categories, admin user, plain users with realistic data, etc.)."""
     try:
@@ -200,90 +202,124 @@ def seed_initial_data():
             from app.models.models import User, Category, MenuItem, SavedAddress, Order, OrderItem, Promocode, ModificationType
             from app.core.security import get_password_hash
             from datetime import datetime, timedelta
+            from concurrent.futures import ThreadPoolExecutor
             import random
-            import json
+            try:
+                # optional, parses the Cyrillic-heavy menu.json several times faster
+                import orjson
+                json_loads = orjson.loads
+            except ImportError:
+                json_loads = json.loads
         except ImportError as e:
             logger.error(f"Import error during seeding: {e}")
             return False
         
-        db = SessionLocal()
+        db = SessionLocal(autoflush=False)  # explicit flushes only, even if the factory default changes
         try:
+            # the whole seed is one transaction: flush where generated ids are needed,
+            # commit once at the end
+            if settings.DATABASE_URL.startswith("postgresql"):
+                # one-off bulk load, don't wait for the WAL fsync on commit
+                db.execute(_SYNC_COMMIT_OFF)
+            
+            # one timestamp for the whole run, so rows inserted together share it
+            now = datetime.utcnow()
+            # fixed seed keeps the generated users/addresses/orders reproducible
+            rng = random.Random(42)
+            # per-row detail only at DEBUG; checked once so the hot loops skip formatting
+            log_rows = logger.isEnabledFor(logging.DEBUG)
+            
             # load real menu data from menu.json
             try:
                 menu_json_path = project_root / "menu.json"
-                with open(menu_json_path, 'r', encoding='utf-8') as f:
-                    menu_data = json.load(f)
+                menu_data = json_loads(menu_json_path.read_bytes())
                 logger.info("Loaded menu data from menu.json")
             except Exception as e:
                 logger.error(f"Failed to load menu.json: {e}")
                 return False
             
             # create categories from menu.json with translations
-            categories = []
+            # new rows are collected as plain dicts and inserted in one executemany per table
+            category_rows = []
+            
+            # one prefetch per table instead of an existence query per row
+            category_names = [category_data["category"] for category_data in menu_data["menu"]]
+            existing_cats = {c.name: c for c in db.query(Category).filter(Category.name.in_(category_names)).all()}
             
             for i, category_data in enumerate(menu_data["menu"], 1):
                 cat_name = category_data["category"]
                 cat_translations = category_data.get("category_translations", {})
                 
-                existing = db.query(Category).filter(Category.name == cat_name).first()
+                existing = existing_cats.get(cat_name)
                 if not existing:
-                    category = Category(
-                        name=cat_name,
-                        name_translations=cat_translations,
-                        sort=i,
-                        created_at=datetime.utcnow(),
-                        updated_at=datetime.utcnow()
-                    )
-                    db.add(category)
-                    categories.append(category)
-                    logger.info(f"Created category: {cat_name} with translations: {list(cat_translations.keys())}")
+                    category_rows.append({
+                        "name": cat_name,
+                        "name_translations": cat_translations,
+                        "sort": i,
+                        # spelled out because COPY skips the model's python-side defaults
+                        "is_active": True,
+                        "sort_order": 0,
+                        "created_at": now,
+                        "updated_at": now
+                    })
+                    if log_rows:
+                        logger.debug(f"Created category: {cat_name} with translations: {list(cat_translations.keys())}")
                 else:
                     # update existing category with translations if not present
                     if not existing.name_translations and cat_translations:
                         existing.name_translations = cat_translations
-                        existing.updated_at = datetime.utcnow()
+                        existing.updated_at = now
                         db.add(existing)
                         logger.info(f"Updated category {cat_name} with translations")
-                    categories.append(existing)
             
-            db.commit()
+            # a fresh seed (the usual case, tables were just truncated) has no existing
+            # rows to reconcile, so on PostgreSQL stream the menu in with COPY
+            use_copy = settings.DATABASE_URL.startswith("postgresql") and not existing_cats
+            if use_copy:
+                copy_rows(db, Category.__tablename__, category_rows)
+            else:
+                db.bulk_insert_mappings(Category, category_rows)
+            db.flush()
+            logger.info("Inserted %d categories", len(category_rows))
             
-            # refresh categories to get IDs
-            for cat in categories:
-                db.refresh(cat)
+            # bulk inserts don't hand back ids, read them back by name
+            category_ids = dict(
+                db.query(Category.name, Category.id).filter(Category.name.in_(category_names)).all()
+            )
             
             # create menu items from menu.json with translations
-            menu_items = []
+            menu_item_rows = []
+            existing_items = {
+                (item.name, item.category_id): item
+                for item in db.query(MenuItem).filter(MenuItem.category_id.in_(list(category_ids.values()))).all()
+            }
             for category_data in menu_data["menu"]:
                 category_name = category_data["category"]
-                category = next((cat for cat in categories if cat.name == category_name), None)
+                category_id = category_ids.get(category_name)
                 
-                if category:
+                if category_id:
                     for item_data in category_data["items"]:
-                        existing_item = db.query(MenuItem).filter(
-                            MenuItem.name == item_data["name"],
-                            MenuItem.category_id == category.id
-                        ).first()
+                        existing_item = existing_items.get((item_data["name"], category_id))
                         if not existing_item:
                             # prices are now in tenge, no conversion needed
                             price_tenge = float(item_data["price"])
                             name_translations = item_data.get("name_translations", {})
                             description_translations = item_data.get("description_translations", {})
                             
-                            menu_item = MenuItem(
-                                category_id=category.id,
-                                name=item_data["name"],
-                                name_translations=name_translations,
-                                description=item_data["description"],
-                                description_translations=description_translations,
-                                price=price_tenge,
-                                is_active=True,
-                                created_at=datetime.utcnow(),
-                                updated_at=datetime.utcnow()
-                            )
-                            db.add(menu_item)
-                            menu_items.append(menu_item)
-                            logger.info(f"Created menu item: {item_data['name']} with translations: name={list(name_translations.keys())}, desc={list(description_translations.keys())}")
+                            menu_item_rows.append({
+                                "category_id": category_id,
+                                "name": item_data["name"],
+                                "name_translations": name_translations,
+                                "description": item_data["description"],
+                                "description_translations": description_translations,
+                                "price": price_tenge,
+                                "is_active": True,
+                                "is_available": True,
+                                "created_at": now,
+                                "updated_at": now
+                            })
+                            if log_rows:
+                                logger.debug(f"Created menu item: {item_data['name']} with translations: name={list(name_translations.keys())}, desc={list(description_translations.keys())}")
                         else:
                             # update existing item with translations if not present
                             name_translations = item_data.get("name_translations", {})
@@ -299,17 +335,20 @@ def seed_initial_data():
                                 updated = True
                                 
                             if updated:
-                                existing_item.updated_at = datetime.utcnow()
+                                existing_item.updated_at = now
                                 db.add(existing_item)
                                 logger.info(f"Updated menu item {item_data['name']} with translations")
-                            
-                            menu_items.append(existing_item)
             
-            db.commit()
+            if use_copy:
+                copy_rows(db, MenuItem.__tablename__, menu_item_rows)
+            else:
+                db.bulk_insert_mappings(MenuItem, menu_item_rows)
+            db.flush()
+            logger.info("Inserted %d menu items across %d categories", len(menu_item_rows), len(category_ids))
             
-            # refresh menu items to get IDs
-            for item in menu_items:
-                db.refresh(item)
+            # load the seeded menu (with ids) for building orders below; ordered, so the
+            # seeded rng picks the same items on every run
+            menu_items = db.query(MenuItem).filter(MenuItem.category_id.in_(list(category_ids.values()))).order_by(MenuItem.id).all()
             
             # create default modification types
             logger.info("Creating default modification types...")
@@ -379,108 +418,48 @@ def seed_initial_data():
             all_modifications = default_sauces + removal_options
             
             # check which modifications already exist
-            existing_names = set()
-            existing_mods = db.query(ModificationType).all()
-            for mod in existing_mods:
-                existing_names.add((mod.name, mod.category))
+            existing_mods = {(mod.name, mod.category): mod for mod in db.query(ModificationType).all()}
             
-            created_count = 0
+            modification_rows = []
             for mod_data in all_modifications:
                 key = (mod_data["name"], mod_data["category"])
-                if key not in existing_names:
-                    modification = ModificationType(
-                        name=mod_data["name"],
-                        name_translations=mod_data.get("name_translations", {}),
-                        category=mod_data["category"],
-                        is_default=mod_data["is_default"],
-                        is_active=True
-                    )
-                    db.add(modification)
-                    created_count += 1
-                    translations = mod_data.get("name_translations", {})
-                    logger.info(f"Created {mod_data['category']} modification: {mod_data['name']} with translations: {list(translations.keys())}")
+                existing_mod = existing_mods.get(key)
+                if existing_mod is None:
+                    modification_rows.append({
+                        "name": mod_data["name"],
+                        "name_translations": mod_data.get("name_translations", {}),
+                        "category": mod_data["category"],
+                        "is_default": mod_data["is_default"],
+                        "is_active": True
+                    })
+                    if log_rows:
+                        translations = mod_data.get("name_translations", {})
+                        logger.debug(f"Created {mod_data['category']} modification: {mod_data['name']} with translations: {list(translations.keys())}")
                 else:
                     # update existing modification with translations if not present
-                    existing_mod = next((mod for mod in existing_mods if mod.name == mod_data["name"] and mod.category == mod_data["category"]), None)
-                    if existing_mod and not existing_mod.name_translations and mod_data.get("name_translations"):
+                    if not existing_mod.name_translations and mod_data.get("name_translations"):
                         existing_mod.name_translations = mod_data["name_translations"]
-                        existing_mod.updated_at = datetime.utcnow()
+                        existing_mod.updated_at = now
                         db.add(existing_mod)
                         logger.info(f"Updated {mod_data['category']} modification {mod_data['name']} with translations")
-                    else:
-                        logger.info(f"Skipped existing {mod_data['category']} modification: {mod_data['name']}")
+                    elif log_rows:
+                        logger.debug(f"Skipped existing {mod_data['category']} modification: {mod_data['name']}")
             
-            if created_count > 0:
-                db.commit()
-                logger.info(f"Successfully created {created_count} modification types.")
+            if modification_rows:
+                db.bulk_insert_mappings(ModificationType, modification_rows)
+                logger.info(f"Successfully created {len(modification_rows)} modification types.")
             else:
                 logger.info("No new modification types were created (all already exist).")
             
-            # display summary
+            # display summary (flush pending translation updates so the counts see them)
+            db.flush()
             total_sauces = db.query(ModificationType).filter(ModificationType.category == "sauce").count()
             total_removals = db.query(ModificationType).filter(ModificationType.category == "removal").count()
             logger.info(f"Database now contains: {total_sauces} sauce modifications, {total_removals} removal modifications")
             
-            # create default admin user
-            admin_email = "admin@ium.app"
-            existing_admin = db.query(User).filter(User.email == admin_email).first()
-            
-            if not existing_admin:
-                admin_user = User(
-                    full_name="APPETIT Admin",
-                    email=admin_email,
-                    phone="+77081234567",
-                    password_hash=get_password_hash("Admin123!"),
-                    role="admin",
-                    is_email_verified=True,
-                    is_phone_verified=True,
-                    created_at=datetime.utcnow(),
-                    updated_at=datetime.utcnow()
-                )
-                db.add(admin_user)
-                logger.info(f"Created admin user: {admin_email}")
-            
-            # create manager user for testing
-            manager_email = "manager@ium.app"
-            existing_manager = db.query(User).filter(User.email == manager_email).first()
-            
-            if not existing_manager:
-                manager_user = User(
-                    full_name="Test Manager",
-                    email=manager_email,
-                    phone="+77081234568",
-                    password_hash=get_password_hash("Manager123!"),
-                    role="manager",
-                    is_email_verified=True,
-                    is_phone_verified=True,
-                    created_at=datetime.utcnow(),
-                    updated_at=datetime.utcnow()
-                )
-                db.add(manager_user)
-                logger.info(f"Created manager user: {manager_email}")
-            
-            # create courier user for testing
-            courier_email = "courier@ium.app"
-            existing_courier = db.query(User).filter(User.email == courier_email).first()
-            
-            if not existing_courier:
-                courier_user = User(
-                    full_name="Test Courier",
-                    email=courier_email,
-                    phone="+77081234569",
-                    password_hash=get_password_hash("Courier123!"),
-                    role="courier",
-                    is_email_verified=True,
-                    is_phone_verified=True,
-                    created_at=datetime.utcnow(),
-                    updated_at=datetime.utcnow()
-                )
-                db.add(courier_user)
-                logger.info(f"Created courier user: {courier_email}")
-            
             # create 2 real users with saved addresses
             # generate random phone for second user
-            random_phone = f"+77{random.randint(7000000000, 7999999999)}"
+            random_phone = f"+77{rng.randint(7000000000, 7999999999)}"
             
             plain_users_data = [
                 {
@@ -503,44 +482,128 @@ def seed_initial_data():
                 }
             ]
             
-            plain_users = []
-            for user_data in plain_users_data:
-                existing_user = db.query(User).filter(User.email == user_data["email"]).first()
-                if not existing_user:
-                    user = User(
-                        full_name=user_data["full_name"],
-                        email=user_data["email"],
-                        phone=user_data["phone"],
-                        password_hash=get_password_hash("User123!"),
-                        role="user",
-                        is_email_verified=True,
-                        is_phone_verified=True,
-                        created_at=datetime.utcnow() - timedelta(days=random.randint(30, 180)),
-                        updated_at=datetime.utcnow()
-                    )
-                    db.add(user)
-                    db.commit()
-                    db.refresh(user)
-                    
-                    # create saved addresses for each user
-                    for addr_data in user_data["addresses"]:
-                        address = SavedAddress(
-                            user_id=user.id,
-                            address_text=addr_data["address_text"],
-                            latitude=addr_data["lat"],
-                            longitude=addr_data["lng"],
-                            label=addr_data["label"],
-                            is_default=addr_data["is_default"],
-                            created_at=datetime.utcnow() - timedelta(days=random.randint(1, 30))
-                        )
-                        db.add(address)
-                    
-                    plain_users.append(user)
-                    logger.info(f"Created plain user: {user_data['email']} with addresses")
-                else:
-                    plain_users.append(existing_user)
+            # bcrypt is deliberately slow (~100ms) and releases the GIL, so hash the
+            # seed passwords concurrently; both plain users share "User123!"
+            passwords = ["Admin123!", "Manager123!", "Courier123!", "User123!"]
+            with ThreadPoolExecutor(max_workers=len(passwords)) as ex:
+                password_hashes = dict(zip(passwords, ex.map(get_password_hash, passwords)))
             
-            db.commit()
+            user_rows = []
+            admin_email = "admin@ium.app"
+            manager_email = "manager@ium.app"
+            courier_email = "courier@ium.app"
+            plain_emails = [user_data["email"] for user_data in plain_users_data]
+            existing_emails = {
+                email for (email,) in db.query(User.email).filter(
+                    User.email.in_([admin_email, manager_email, courier_email, *plain_emails])
+                ).all()
+            }
+            
+            # create default admin user
+            existing_admin = admin_email in existing_emails
+            
+            if not existing_admin:
+                user_rows.append({
+                    "full_name": "APPETIT Admin",
+                    "email": admin_email,
+                    "phone": "+77081234567",
+                    "password_hash": password_hashes["Admin123!"],
+                    "role": "admin",
+                    "is_email_verified": True,
+                    "is_phone_verified": True,
+                    "created_at": now,
+                    "updated_at": now
+                })
+                logger.info(f"Created admin user: {admin_email}")
+            
+            # create manager user for testing
+            existing_manager = manager_email in existing_emails
+            
+            if not existing_manager:
+                user_rows.append({
+                    "full_name": "Test Manager",
+                    "email": manager_email,
+                    "phone": "+77081234568",
+                    "password_hash": password_hashes["Manager123!"],
+                    "role": "manager",
+                    "is_email_verified": True,
+                    "is_phone_verified": True,
+                    "created_at": now,
+                    "updated_at": now
+                })
+                logger.info(f"Created manager user: {manager_email}")
+            
+            # create courier user for testing
+            existing_courier = courier_email in existing_emails
+            
+            if not existing_courier:
+                user_rows.append({
+                    "full_name": "Test Courier",
+                    "email": courier_email,
+                    "phone": "+77081234569",
+                    "password_hash": password_hashes["Courier123!"],
+                    "role": "courier",
+                    "is_email_verified": True,
+                    "is_phone_verified": True,
+                    "created_at": now,
+                    "updated_at": now
+                })
+                logger.info(f"Created courier user: {courier_email}")
+            
+            new_plain_users = []
+            for user_data in plain_users_data:
+                if user_data["email"] not in existing_emails:
+                    user_rows.append({
+                        "full_name": user_data["full_name"],
+                        "email": user_data["email"],
+                        "phone": user_data["phone"],
+                        "password_hash": password_hashes["User123!"],
+                        "role": "user",
+                        "is_email_verified": True,
+                        "is_phone_verified": True,
+                        "created_at": now - timedelta(days=rng.randint(30, 180)),
+                        "updated_at": now
+                    })
+                    new_plain_users.append(user_data)
+            
+            db.bulk_insert_mappings(User, user_rows)
+            db.flush()
+            
+            # read back the plain users to attach addresses and orders
+            users_by_email = {u.email: u for u in db.query(User).filter(User.email.in_(plain_emails)).all()}
+            plain_users = [users_by_email[email] for email in plain_emails if email in users_by_email]
+            
+            # create saved addresses for each new user, keeping them client-side for the orders
+            address_rows = []
+            user_addresses_by_uid: dict[int, list[dict]] = {}
+            for user_data in new_plain_users:
+                user = users_by_email[user_data["email"]]
+                for addr_data in user_data["addresses"]:
+                    row = {
+                        "user_id": user.id,
+                        "address_text": addr_data["address_text"],
+                        "latitude": addr_data["lat"],
+                        "longitude": addr_data["lng"],
+                        "label": addr_data["label"],
+                        "is_default": addr_data["is_default"],
+                        "created_at": now - timedelta(days=rng.randint(1, 30))
+                    }
+                    address_rows.append(row)
+                    user_addresses_by_uid.setdefault(user.id, []).append(row)
+                logger.info(f"Created plain user: {user_data['email']} with addresses")
+            
+            # users from an earlier run already have their addresses in the database
+            old_uids = [user.id for user in plain_users if user.id not in user_addresses_by_uid]
+            if old_uids:
+                for addr in db.query(SavedAddress).filter(SavedAddress.user_id.in_(old_uids)).order_by(SavedAddress.id).all():
+                    user_addresses_by_uid.setdefault(addr.user_id, []).append({
+                        "address_text": addr.address_text,
+                        "latitude": addr.latitude,
+                        "longitude": addr.longitude,
+                    })
+            
+            db.bulk_insert_mappings(SavedAddress, address_rows)
+            db.flush()
             
             # create some promocodes for realistic usage
             promo_codes_data = [
@@ -549,85 +612,104 @@ def seed_initial_data():
                 {"code": "NEWUSER20", "kind": "percent", "discount_percent": 20.0, "max_uses": 100, "is_active": True, "current_uses": 0},
             ]
             
+            promo_rows = []
+            existing_codes = {
+                code for (code,) in db.query(Promocode.code).filter(
+                    Promocode.code.in_([promo_data["code"] for promo_data in promo_codes_data])
+                ).all()
+            }
             for promo_data in promo_codes_data:
-                existing_promo = db.query(Promocode).filter(Promocode.code == promo_data["code"]).first()
-                if not existing_promo:
-                    promo = Promocode(**promo_data, created_at=datetime.utcnow())
-                    db.add(promo)
+                if promo_data["code"] not in existing_codes:
+                    promo_rows.append({**promo_data, "created_at": now})
                     logger.info(f"Created promocode: {promo_data['code']}")
             
-            db.commit()
+            db.bulk_insert_mappings(Promocode, promo_rows)
             
             # create 2 orders in each state for each user
             order_states = ["NEW", "COOKING", "ON_WAY", "DELIVERED", "CANCELLED"]
             order_counter = 1000
+            order_rows = []
+            # [(menu item, qty), ...] per order, parallel to order_rows
+            order_lines = []
             
             for user in plain_users:
-                user_addresses = db.query(SavedAddress).filter(SavedAddress.user_id == user.id).all()
+                user_addresses = user_addresses_by_uid.get(user.id)
                 if not user_addresses:
                     continue
                 
                 for state in order_states:
                     for i in range(2):  # 2 orders per state
                         order_counter += 1
-                        random_address = random.choice(user_addresses)
+                        random_address = rng.choice(user_addresses)
                         
                         # create realistic order timing based on status
                         if state == "NEW":
-                            created_time = datetime.utcnow() - timedelta(minutes=random.randint(1, 30))
+                            created_time = now - timedelta(minutes=rng.randint(1, 30))
                         elif state == "COOKING":
-                            created_time = datetime.utcnow() - timedelta(minutes=random.randint(30, 60))
+                            created_time = now - timedelta(minutes=rng.randint(30, 60))
                         elif state == "ON_WAY":
-                            created_time = datetime.utcnow() - timedelta(minutes=random.randint(60, 120))
+                            created_time = now - timedelta(minutes=rng.randint(60, 120))
                         elif state == "DELIVERED":
-                            created_time = datetime.utcnow() - timedelta(days=random.randint(1, 30))
+                            created_time = now - timedelta(days=rng.randint(1, 30))
                         else:  # CANCELLED
-                            created_time = datetime.utcnow() - timedelta(days=random.randint(1, 7))
+                            created_time = now - timedelta(days=rng.randint(1, 7))
                         
                         # select random menu items for the order
-                        selected_items = random.sample(menu_items, random.randint(2, 4))
-                        subtotal = 0
+                        selected_items = rng.sample(menu_items, rng.randint(2, 4))
+                        lines = [(menu_item, rng.randint(1, 3)) for menu_item in selected_items]
+                        # totals are known up front, so orders are inserted complete
+                        subtotal = sum(qty * float(menu_item.price) for menu_item, qty in lines)
                         
-                        order = Order(
-                            number=f"ORD-{order_counter}",
-                            user_id=user.id,
-                            pickup_or_delivery=random.choice(["delivery", "pickup"]),
-                            address_text=random_address.address_text,
-                            lat=random_address.latitude,
-                            lng=random_address.longitude,
-                            status=state,
-                            subtotal=0,  # will calculate below
-                            discount=0,
-                            total=0,  # will calculate below
-                            payment_method=random.choice(["cod", "online"]),
-                            paid=(state in ["DELIVERED", "CANCELLED"] or random.choice([True, False])),
-                            created_at=created_time
-                        )
-                        db.add(order)
-                        db.flush()  # Get ID without committing
+                        number = f"ORD-{order_counter}"
+                        order_rows.append({
+                            "number": number,
+                            "user_id": user.id,
+                            "pickup_or_delivery": rng.choice(["delivery", "pickup"]),
+                            "address_text": random_address["address_text"],
+                            "lat": random_address["latitude"],
+                            "lng": random_address["longitude"],
+                            "status": state,
+                            "subtotal": subtotal,
+                            "discount": 0,
+                            "total": subtotal,
+                            "payment_method": rng.choice(["cod", "online"]),
+                            "paid": (state in ["DELIVERED", "CANCELLED"] or rng.choice([True, False])),
+                            "created_at": created_time
+                        })
+                        order_lines.append(lines)
                         
-                        # create order items
-                        for menu_item in selected_items:
-                            qty = random.randint(1, 3)
-                            price = float(menu_item.price)
-                            subtotal += qty * price
-                            
-                            order_item = OrderItem(
-                                order_id=order.id,
-                                item_id=menu_item.id,
-                                name_snapshot=menu_item.name,
-                                qty=qty,
-                                price_at_moment=price
-                            )
-                            db.add(order_item)
-                        
-                        # update order totals
-                        order.subtotal = subtotal
-                        order.total = subtotal
-                        db.add(order)
-                        
-                        logger.info(f"Created {state} order {order.number} for {user.email}")
-            
+                        if log_rows:
+                            logger.debug(f"Created {state} order {number} for {user.email}")
+            
+            # INSERT ... RETURNING in one round trip; ids come back in parameter order
+            order_ids = []
+            if order_rows:
+                order_ids = db.execute(
+                    insert(Order).returning(Order.id, sort_by_parameter_order=True), order_rows
+                ).scalars().all()
+            
+            # create order items
+            order_item_rows = []
+            for order_id, lines in zip(order_ids, order_lines):
+                for menu_item, qty in lines:
+                    order_item_rows.append({
+                        "order_id": order_id,
+                        "item_id": menu_item.id,
+                        "name_snapshot": menu_item.name,
+                        "qty": qty,
+                        "price_at_moment": float(menu_item.price),
+                        # set explicitly: COPY bypasses the model's python-side defaults
+                        "created_at": now,
+                        "updated_at": now
+                    })
+            
+            if settings.DATABASE_URL.startswith("postgresql"):
+                # largest seeded table, stream it with COPY instead of INSERTs
+                copy_rows(db, OrderItem.__tablename__, order_item_rows)
+            elif order_item_rows:
+                # Core insert with a parameter list compiles to a real executemany
+                db.execute(insert(OrderItem), order_item_rows)
+            logger.info("Inserted %d orders with %d order items", len(order_ids), len(order_item_rows))
             db.commit()
             logger.info("Enhanced data seeded successfully with users, addresses, menu items, and orders")
             return True
@@ -646,7 +728,7 @@ def check_database_connection():
         logger.info("Testing database connection...")
         
         with engine.connect() as conn:
-            result = conn.execute(text("SELECT 1"))
+            result = conn.execute(_SELECT_1)
             result.fetchone()
             
         logger.info("Database connection successful")
@@ -2,121 +2,111 @@
 """
 Data migration script to populate translation fields with existing data as English default.
 Run this after adding translation fields to ensure backwards compatibility.
+PostgreSQL only, like the app itself (app.db.session rejects other backends).
 """
 import sys
 import os
+import logging
+from datetime import datetime
 
 # add the project root to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from sqlalchemy.orm import Session
-from app.db.session import SessionLocal
+from sqlalchemy import Text, and_, case, cast, func, or_, select, text, update
+from sqlalchemy.engine import Connection
+from app.db.session import engine
 from app import models
-from app.services.locale.locale_helper import populate_translation_field
 
+# configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
 
-def populate_category_translations():
-    """populate category name translations with existing names as English default."""
-    print("Populating category translations...")
-    db: Session = SessionLocal()
-    try:
-        categories = db.query(models.Category).all()
-        updated_count = 0
-        
-        for category in categories:
-            if category.name and not category.name_translations:
-                category.name_translations = populate_translation_field(category.name)
-                updated_count += 1
-        
-        db.commit()
-        print(f"Updated {updated_count} categories with translation data")
-        
-    except Exception as e:
-        print(f"Error updating categories: {e}")
-        db.rollback()
-    finally:
-        db.close()
+# (table, text fields whose "<field>_translations" get an English default, label for output);
+# plain Core tables, the backfill needs no identity map, unit of work or events
+TRANSLATED_FIELDS = (
+    (models.Category.__table__, ("name",), "categories"),
+    (models.MenuItem.__table__, ("name", "description"), "menu items"),
+    (models.ModificationType.__table__, ("name",), "modification types"),
+)
 
 
-def populate_menu_item_translations():
-    """populate menu item name and description translations with existing data as English default."""
-    print("Populating menu item translations...")
-    db: Session = SessionLocal()
-    try:
-        menu_items = db.query(models.MenuItem).all()
-        updated_count = 0
-        
-        for item in menu_items:
-            needs_update = False
-            
-            # update name translations
-            if item.name and not item.name_translations:
-                item.name_translations = populate_translation_field(item.name)
-                needs_update = True
-            
-            # update description translations
-            if item.description and not item.description_translations:
-                item.description_translations = populate_translation_field(item.description)
-                needs_update = True
-            
-            if needs_update:
-                updated_count += 1
-        
-        db.commit()
-        print(f"Updated {updated_count} menu items with translation data")
-        
-    except Exception as e:
-        print(f"Error updating menu items: {e}")
-        db.rollback()
-    finally:
-        db.close()
+def _missing_translations(column):
+    """sql predicate for an unset translations column (SQL NULL, JSON null or an empty object)."""
+    return or_(column.is_(None), cast(column, Text).in_(("null", "{}")))
 
 
-def populate_modification_type_translations():
-    """populate modification type name translations with existing names as English default."""
-    print("Populating modification type translations...")
-    db: Session = SessionLocal()
-    try:
-        modification_types = db.query(models.ModificationType).all()
-        updated_count = 0
-        
-        for mod_type in modification_types:
-            if mod_type.name and not mod_type.name_translations:
-                mod_type.name_translations = populate_translation_field(mod_type.name)
-                updated_count += 1
-        
-        db.commit()
-        print(f"Updated {updated_count} modification types with translation data")
-        
-    except Exception as e:
-        print(f"Error updating modification types: {e}")
-        db.rollback()
-    finally:
-        db.close()
+def _field_missing(table, field):
+    """sql predicate: the field has text but its translations column is unset."""
+    value_col = table.c[field]
+    return and_(value_col.isnot(None), value_col != "", _missing_translations(table.c[f"{field}_translations"]))
+
+
+def _analyze_tables(vacuum: bool = False):
+    """refresh planner statistics for the backfilled tables, optionally reclaiming dead tuples."""
+    tables = ", ".join(table.name for table, _, _ in TRANSLATED_FIELDS)
+    # VACUUM can't run inside a transaction block
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(f"{'VACUUM ANALYZE' if vacuum else 'ANALYZE'} {tables}"))
+
+
+def _translation_update(table, fields):
+    """server-side UPDATE filling the English default of each field."""
+    missing = {field: _field_missing(table, field) for field in fields}
+    
+    # every column in one statement, each row is touched at most once
+    values = {
+        f"{field}_translations": case(
+            # translations columns are JSON (not JSONB), so the json_ builder
+            (missing[field], func.json_build_object("en", table.c[field])),
+            else_=table.c[f"{field}_translations"],
+        )
+        for field in fields
+    }
+    # explicit, the column's python-side onupdate can't be prefetched inside a CTE
+    values["updated_at"] = datetime.utcnow()
+    return update(table).where(or_(*missing.values())).values(values)
+
+
+def populate_all_translations(conn: Connection):
+    """run every table's UPDATE as a data-modifying CTE of one statement."""
+    logger.debug("Populating all translations in one statement...")
+    updated = [
+        _translation_update(table, fields).returning(table.c.id).cte(f"{table.name}_updated")
+        for table, fields, _ in TRANSLATED_FIELDS
+    ]
+    # one parse/plan/round trip for all tables
+    counts = conn.execute(
+        select(*[select(func.count()).select_from(cte).scalar_subquery() for cte in updated])
+    ).one()
+    
+    for (_, _, label), count in zip(TRANSLATED_FIELDS, counts):
+        logger.info("Updated %d %s with translation data", count, label)
 
 
 def main():
     """run all translation population tasks."""
-    print("Starting translation data population...")
-    print("=" * 50)
+    logger.info("Starting translation data population...")
+    
+    # fresh stats for the UPDATE plans
+    _analyze_tables()
     
     try:
-        populate_category_translations()
-        print()
+        # all-or-nothing backfill: one transaction, committed on exit, rolled back on error
+        with engine.begin() as conn:
+            populate_all_translations(conn)
         
-        populate_menu_item_translations()
-        print()
-        
-        populate_modification_type_translations()
-        print()
-        
-        print("=" * 50)
-        print("Translation data population completed successfully!")
+        logger.info("Translation data population completed successfully")
         
     except Exception as e:
-        print(f"Error during migration: {e}")
+        logger.error(f"Error during migration: {e}")
         sys.exit(1)
+    
+    # the bulk UPDATEs leave a dead tuple per touched row
+    _analyze_tables(vacuum=True)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
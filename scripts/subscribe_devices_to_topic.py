@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Backfill script subscribing existing devices to the all-devices FCM topic.
+Run this once after deploying the topic_subscribed migration; devices registered
+afterwards are subscribed on registration.
+"""
+import sys
+import os
+import logging
+
+# add the project root to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import select, update
+from app.db.session import engine
+from app import models
+from app.services.push import fcm_admin
+
+# configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def subscribe_pending_devices() -> tuple[int, int]:
+    """subscribe every device not yet on ALL_DEVICES_TOPIC; returns (subscribed, failed)."""
+    devices = models.Device.__table__
+    subscribed = failed = 0
+    last_id = 0
+    
+    while True:
+        # keyset pagination, one FCM call per page
+        with engine.connect() as conn:
+            rows = conn.execute(
+                select(devices.c.id, devices.c.fcm_token)
+                .where(devices.c.id > last_id, devices.c.topic_subscribed.is_(False), devices.c.fcm_token.is_not(None))
+                .order_by(devices.c.id)
+                .limit(fcm_admin.TOPIC_BATCH_LIMIT)
+            ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        
+        result = fcm_admin.subscribe_to_topic([row.fcm_token for row in rows], fcm_admin.ALL_DEVICES_TOPIC)
+        if result.get("status") not in ("success", "partial", "failed"):
+            raise RuntimeError(f"Topic subscription failed: {result.get('error') or result.get('reason')}")
+        
+        # "failed" only means FCM rejected every token of the page, those stay unsubscribed
+        rejected = set(result.get("failed_tokens", []))
+        ok_ids = [row.id for row in rows if row.fcm_token not in rejected]
+        # record each page as soon as FCM accepted it, a rerun picks up where this stopped
+        with engine.begin() as conn:
+            if ok_ids:
+                conn.execute(update(devices).where(devices.c.id.in_(ok_ids)).values(topic_subscribed=True))
+        subscribed += len(ok_ids)
+        failed += len(rows) - len(ok_ids)
+    
+    return subscribed, failed
+
+
+def main():
+    """run the topic subscription backfill."""
+    logger.info(f"Subscribing devices to '{fcm_admin.ALL_DEVICES_TOPIC}'...")
+    try:
+        fcm_admin._ensure_init(strict=True)
+        if not fcm_admin._initialized:
+            raise RuntimeError("FCM is not configured")
+        subscribed, failed = subscribe_pending_devices()
+    except Exception as e:
+        logger.error(f"Error during backfill: {e}")
+        sys.exit(1)
+    
+    logger.info("Subscribed %d devices, %d rejected (left unsubscribed)", subscribed, failed)
+
+
+if __name__ == "__main__":
+    main()